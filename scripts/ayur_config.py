@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Shared locations and defaults for the data scripts.
+
+Everything here can be overridden through AYUR_* environment variables:
+AYUR_CACHE_DIR moves the on-disk caches (page text, parsed sources, HTTP
+responses, pipeline state) and AYUR_WORKERS sets how many processes the
+parallel stages use.
+"""
+
+import os
+from typing import Optional
+
+CACHE_DIR = os.environ.get(
+    'AYUR_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache')
+)
+
+
+def default_workers(env_var: Optional[str] = None) -> int:
+    """Process count from env_var if given and set, then AYUR_WORKERS, then the CPU count"""
+    configured = (env_var and os.environ.get(env_var)) or os.environ.get('AYUR_WORKERS')
+    return int(configured or os.cpu_count() or 1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for de-duplicating extracted disease mentions.
+
+extract_disease_info_from_text() used to rebuild the list of known names and
+scan it for every regex match, which is quadratic in the number of matches.
+This feeds the same synthetic stream of mentions (about half of them repeats)
+to that loop and to DiseaseAccumulator at growing sizes, checks both keep the
+same names in the same order, and prints the time per size so the growth
+rate is visible. The legacy loop is skipped above LEGACY_LIMIT mentions.
+
+Usage: python benchmark_disease_accumulator.py [max_mentions]
+"""
+
+import random
+import sys
+import time
+
+from enhance_disease_data import DiseaseAccumulator
+
+LEGACY_LIMIT = 20_000
+DOSHAS = ['Vata', 'Pitta', 'Kapha']
+TREATMENT_TYPES = ['Herbal', 'Therapy', 'Dietary', 'Lifestyle']
+
+
+def make_mentions(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    names = [f"Disease{i}" for i in range(count // 2 or 1)]
+    return [{'name': rng.choice(names),
+             'dosha': rng.sample(DOSHAS, rng.randint(0, 2)),
+             'treatmentTypes': rng.sample(TREATMENT_TYPES, rng.randint(0, 2))}
+            for _ in range(count)]
+
+
+def legacy_accumulate(mentions):
+    """The list rebuild and linear scan used before DiseaseAccumulator"""
+    disease_info = []
+    for disease_data in mentions:
+        existing_names = [d['name'] for d in disease_info]
+        if disease_data['name'] not in existing_names:
+            disease_info.append(disease_data)
+    return disease_info
+
+
+def accumulate(mentions):
+    accumulator = DiseaseAccumulator()
+    for disease_data in mentions:
+        accumulator.add(dict(disease_data, dosha=list(disease_data['dosha']),
+                             treatmentTypes=list(disease_data['treatmentTypes'])))
+    return accumulator.records
+
+
+def timed(fn, mentions):
+    start = time.perf_counter()
+    result = fn(mentions)
+    return result, time.perf_counter() - start
+
+
+def main():
+    max_mentions = int(sys.argv[1]) if len(sys.argv) > 1 else 160_000
+    print(f"{'mentions':>10} {'legacy s':>10} {'accumulator s':>14} {'speedup':>9}")
+    size = 2_500
+    while size <= max_mentions:
+        mentions = make_mentions(size)
+        records, fast = timed(accumulate, mentions)
+        if size <= LEGACY_LIMIT:
+            legacy, slow = timed(legacy_accumulate, mentions)
+            if [d['name'] for d in legacy] != [d['name'] for d in records]:
+                raise SystemExit(f"Accumulator kept different diseases at {size} mentions")
+            print(f"{size:10,} {slow:10.3f} {fast:14.4f} {slow / fast:8.0f}x")
+        else:
+            print(f"{size:10,} {'-':>10} {fast:14.4f} {'-':>9}")
+        size *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark disease mention extraction in enhance_disease_data.py.
+
+Extracts the text of the Lad home-remedies book and the Scientific Basis
+PDF (through the page cache, so only the first run parses the PDFs), then
+runs the per-sentence loop extract_disease_info_from_text() used before
+and the compiled MentionScanner pass over each text, checks both return
+the same records, and reports sentences/sec for each.
+
+Usage: python benchmark_disease_mentions.py [pdf ...] [--repeats N]
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from enhance_disease_data import (AYURVEDIC_TERMS, DOSHA_PATTERNS, TREATMENT_PATTERNS, DiseaseAccumulator,
+                                  extract_disease_info_from_text, extract_text_from_pdf)
+
+DEFAULT_PDFS = [
+    'The_Complete_Book_of_Ayurvedic_Home_Remedies.pdf',
+    'src/Scientific_Basis_for_Ayurvedic_Therapies.pdf',
+]
+
+LEGACY_PATTERNS = [
+    r'(\w+)\s*\(([^)]+)\)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*-\s*([^.]*)',
+    r'(\w+)\s*:\s*([^.]*)',
+]
+
+
+def legacy_extract(text):
+    """The sentence-by-sentence loop used before MentionScanner"""
+    disease_info = DiseaseAccumulator()
+    for sentence in text.split('.'):
+        sentence = sentence.strip()
+        if len(sentence) < 20:
+            continue
+        sentence_lower = sentence.lower()
+        doshas = [dosha.capitalize() for dosha, keywords in DOSHA_PATTERNS.items()
+                  if any(keyword in sentence_lower for keyword in keywords)]
+        treatment_types = [treatment_type.capitalize() for treatment_type, keywords in TREATMENT_PATTERNS.items()
+                           if any(keyword in sentence_lower for keyword in keywords)]
+        for pattern in LEGACY_PATTERNS:
+            for match in re.findall(pattern, sentence, re.IGNORECASE):
+                disease_name, description = match[0].strip(), match[1].strip()
+                if len(disease_name) < 3 or disease_name.lower() in ['the', 'and', 'or', 'but', 'in', 'on', 'at']:
+                    continue
+                disease_info.add({
+                    'name': disease_name,
+                    'sanskrit': disease_name if disease_name.lower() in AYURVEDIC_TERMS else '',
+                    'englishName': AYURVEDIC_TERMS.get(disease_name.lower(), disease_name),
+                    'description': description,
+                    'dosha': list(doshas),
+                    'treatmentTypes': list(treatment_types),
+                    'source': 'Extracted from Ayurvedic texts',
+                    'severity': 'Moderate',
+                    'category': 'General',
+                    'symptoms': [],
+                    'causes': [],
+                    'treatments': [],
+                    'diet': {'include': [], 'avoid': []},
+                    'lifestyle': [],
+                    'precautions': []
+                })
+    return disease_info.records
+
+
+def best_time(fn, text, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdfs', nargs='*', default=DEFAULT_PDFS)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    for pdf_path in args.pdfs:
+        if not Path(pdf_path).exists():
+            print(f"PDF file not found: {pdf_path}")
+            continue
+        text = extract_text_from_pdf(pdf_path)
+        sentences = sum(1 for sentence in text.split('.') if len(sentence.strip()) >= 20)
+
+        legacy, legacy_seconds = best_time(legacy_extract, text, args.repeats)
+        scanned, seconds = best_time(extract_disease_info_from_text, text, args.repeats)
+        if legacy != scanned:
+            raise SystemExit(f"MentionScanner records differ from the per-sentence loop on {pdf_path}")
+
+        print(f"{pdf_path}: {sentences:,} sentences, {len(scanned):,} diseases, best of {args.repeats}")
+        print(f"  per-sentence loop:  {sentences / legacy_seconds:12,.0f} sentences/sec")
+        print(f"  MentionScanner:     {sentences / seconds:12,.0f} sentences/sec  ({legacy_seconds / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark disease matching in enhance_disease_data.enhance_existing_diseases.
+
+Builds a synthetic workload (10k existing diseases x 100k extracted records
+by default) whose names mix Devanagari, IAST and plain ASCII spellings of the
+same terms, then compares the original nested loop (lowercased name /
+Sanskrit equality against every extracted record) with the NameIndex lookup.
+The nested loop is timed on a sample of the existing diseases and
+extrapolated, since the full run would take hours. Every disease the loop
+matches must also be matched by the index.
+
+Usage: python benchmark_enhance_matching.py [existing] [extracted] [sample]
+"""
+
+import random
+import sys
+import time
+
+from sanskrit_names import NameIndex
+
+# (IAST, plain ASCII, Devanagari) spellings
+TERMS = [
+    ('Jvara', 'Jwara', 'ज्वर'), ('Kāsa', 'Kasa', 'कास'), ('Śvāsa', 'Shwasa', 'श्वास'),
+    ('Āmavāta', 'Amavata', 'आमवात'), ('Amlapitta', 'Amlapitta', 'अम्लपित्त'),
+    ('Kuṣṭha', 'Kushtha', 'कुष्ठ'), ('Hṛdroga', 'Hridroga', 'हृद्रोग'),
+    ('Rājayakṣmā', 'Rajayakshma', 'राजयक्ष्मा'), ('Chardi', 'Chhardi', 'छर्दि'),
+    ('Pāṇḍu', 'Pandu', 'पाण्डु'), ('Kāmalā', 'Kamala', 'कामला'), ('Atīsāra', 'Atisara', 'अतीसार'),
+    ('Gṛdhrasī', 'Gridhrasi', 'गृध्रसी'), ('Madhumeha', 'Madhumeha', 'मधुमेह'),
+    ('Apasmāra', 'Apasmara', 'अपस्मार'), ('Unmāda', 'Unmada', 'उन्माद'),
+]
+SYLLABLES = ['ka', 'ra', 'ma', 'ta', 'shi', 'vri', 'dha', 'pa', 'na', 'su', 'ga', 'ja', 'lo', 'ha']
+
+
+def make_name(rng: random.Random, spelling: int) -> str:
+    if rng.random() < 0.3:
+        return rng.choice(TERMS)[spelling]
+    word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+    return word.capitalize() + (f" {rng.randint(1, 9999)}" if rng.random() < 0.8 else '')
+
+
+def make_workload(existing: int, extracted: int, seed: int = 7):
+    rng = random.Random(seed)
+    diseases = [{'name': make_name(rng, 1), 'sanskrit': make_name(rng, rng.choice((0, 2)))}
+                for _ in range(existing)]
+    records = [{'name': make_name(rng, rng.randrange(3)), 'sanskrit': make_name(rng, 0) if rng.random() < 0.5 else ''}
+               for _ in range(extracted)]
+    return diseases, records
+
+
+def legacy_find(disease, extracted_info):
+    """The nested-loop match enhance_existing_diseases used before"""
+    for position, extracted in enumerate(extracted_info):
+        if (disease['name'].lower() == extracted['name'].lower() or
+            disease['sanskrit'] and disease['sanskrit'].lower() == extracted['sanskrit'].lower()):
+            return position
+    return None
+
+
+def main():
+    existing = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    extracted = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    sample = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    diseases, records = make_workload(existing, extracted)
+
+    start = time.perf_counter()
+    index = NameIndex(records)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [index.position(disease) for disease in diseases]
+    lookup = time.perf_counter() - start
+
+    sampled = diseases[:sample]
+    start = time.perf_counter()
+    legacy = [legacy_find(disease, records) for disease in sampled]
+    legacy_seconds = (time.perf_counter() - start) * existing / len(sampled)
+
+    missed = sum(1 for old, new in zip(legacy, indexed) if old is not None and new is None)
+    if missed:
+        raise SystemExit(f"NameIndex missed {missed} matches the nested loop found")
+
+    indexed_seconds = build + lookup
+    print(f"{existing:,} existing x {extracted:,} extracted diseases")
+    print(f"  nested loop:  {legacy_seconds:10.2f}s (extrapolated from {len(sampled)} diseases), "
+          f"{sum(p is not None for p in legacy)}/{len(sampled)} matched in the sample")
+    print(f"  NameIndex:    {indexed_seconds:10.2f}s (build {build:.2f}s, lookups {lookup:.2f}s), "
+          f"{sum(p is not None for p in indexed[:len(sampled)])}/{len(sampled)} matched in the sample, "
+          f"{sum(p is not None for p in indexed):,} overall  ({legacy_seconds / indexed_seconds:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the spider's ingredient matching.
+
+Runs the per-sentence regex rebuild the spider used before against the
+compiled IngredientMatcher over every text field of a crawled disease
+database (backend/data/disease_database.json by default), and reports
+sentences/sec for each.
+
+Usage: python benchmark_ingredient_matcher.py [database.json] [repeats]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+from ingredient_matcher import IngredientMatcher
+from scrape_ayurveda import AyurvedaSpider
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'data', 'disease_database.json')
+
+
+def iter_strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_strings(item)
+
+
+def legacy_match(text, herb_keywords, toxic_ingredients):
+    """The spider's treatment extraction before IngredientMatcher"""
+    ingredients = re.findall(r'\b(' + '|'.join(herb_keywords + toxic_ingredients) + r')\b', text, re.I)
+    toxic = any(i in ingredients for i in toxic_ingredients)
+    herbs = [i for i in ingredients if i in herb_keywords]
+    return ingredients, herbs, toxic
+
+
+def sentences_per_sec(run, corpus, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in corpus:
+            run(text)
+        best = min(best, time.perf_counter() - start)
+    return len(corpus) / best
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CORPUS
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with open(path, 'r', encoding='utf-8') as f:
+        corpus = list(iter_strings(json.load(f)))
+
+    herbs, toxic = AyurvedaSpider.herb_keywords, AyurvedaSpider.toxic_ingredients
+    matcher = IngredientMatcher(herbs, toxic)
+
+    legacy = sentences_per_sec(lambda text: legacy_match(text, herbs, toxic), corpus, repeats)
+    compiled = sentences_per_sec(matcher.match, corpus, repeats)
+    hits = sum(len(matcher.match(text).ingredients) for text in corpus)
+    print(f"{len(corpus)} text fields from {path} ({hits} ingredient hits), best of {repeats}")
+    print(f"  per-sentence regex:  {legacy:12,.0f} sentences/sec")
+    print(f"  IngredientMatcher:   {compiled:12,.0f} sentences/sec  ({compiled / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark heading classification in extract_lad_diseases_refined.py.
+
+Compares the precompiled is_disease_heading() against the original loop
+(one substring test per skip keyword and per known disease, plus two
+uncompiled regex searches) on a synthetic set of encyclopedia headings, and
+checks that both accept exactly the same headings.
+
+Usage: python benchmark_lad_headings.py [headings] [repeats]
+"""
+
+import random
+import re
+import sys
+import time
+
+from extract_lad_diseases_refined import COMMON_DISEASES, SKIP_KEYWORDS, is_disease_heading
+
+
+def legacy_is_disease_heading(name: str) -> bool:
+    """The per-keyword loop the refined extractor used before"""
+    if any(keyword in name.upper() for keyword in SKIP_KEYWORDS):
+        return False
+
+    name_lower = name.lower()
+    for disease in COMMON_DISEASES:
+        if disease.lower() in name_lower or name_lower in disease.lower():
+            return True
+
+    disease_patterns = [
+        r'\b(itis|osis|emia|algia|rrhagia|rrhea|plegia|trophy|pathy|oma|cele)\b',
+        r'\b(pain|disease|disorder|syndrome|infection|inflammation)\b'
+    ]
+    for pattern in disease_patterns:
+        if re.search(pattern, name_lower):
+            return True
+
+    if len(name.split()) <= 3 and name.isupper():
+        return True
+
+    return False
+
+
+def sample_headings(count: int, seed: int = 0):
+    """Headings shaped like the ones the segmenter finds in the book"""
+    rng = random.Random(seed)
+    words = ['CHRONIC', 'ACUTE', 'LOWER', 'BACK', 'SKIN', 'JOINT', 'NERVE', 'HERBS', 'FOR',
+             'AND', 'OF', 'THE', 'GHEE', 'MILK', 'TEA', 'NEURALGIA', 'ARTHROSIS', 'GASTRIC']
+    vocab = [d.upper() for d in COMMON_DISEASES] + SKIP_KEYWORDS + words
+    return [' '.join(rng.choice(vocab) for _ in range(rng.randint(1, 5))) for _ in range(count)]
+
+
+def throughput(classify, headings, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for heading in headings:
+            classify(heading)
+        best = min(best, time.perf_counter() - start)
+    return len(headings) / best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    headings = sample_headings(count)
+
+    mismatches = [h for h in headings if legacy_is_disease_heading(h) != is_disease_heading(h)]
+    if mismatches:
+        print(f"Classifiers disagree on {len(mismatches)} headings, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+
+    legacy = throughput(legacy_is_disease_heading, headings, repeats)
+    compiled = throughput(is_disease_heading, headings, repeats)
+    accepted = sum(map(is_disease_heading, headings))
+    print(f"{count} headings ({accepted} accepted), best of {repeats}")
+    print(f"  legacy loop:  {legacy:12,.0f} headings/sec")
+    print(f"  precompiled:  {compiled:12,.0f} headings/sec  ({compiled / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
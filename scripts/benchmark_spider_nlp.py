@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark the spider's spaCy configurations.
+
+Compares the current setup (full en_core_web_sm + entity ruler, one
+self.nlp() call per document) against the lean profile (sentencizer +
+entity ruler) run through nlp.pipe, on synthetic section texts built from
+the spider's own vocabularies. Reports docs/sec for each.
+
+Usage: python benchmark_spider_nlp.py [docs] [n_process]
+"""
+
+import random
+import sys
+import time
+
+from scrape_ayurveda import AyurvedaSpider
+
+
+def sample_texts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    vocab = (list(AyurvedaSpider.modern_correlations) + AyurvedaSpider.symptom_keywords +
+             AyurvedaSpider.herb_keywords + AyurvedaSpider.treatment_keywords +
+             ['the', 'patient', 'with', 'is', 'given', 'and', 'of', 'Vata', 'Pitta', 'Kapha'])
+    texts = []
+    for _ in range(count):
+        sentences = [' '.join(rng.choice(vocab) for _ in range(rng.randint(6, 20))) + '.'
+                     for _ in range(rng.randint(2, 12))]
+        texts.append(' '.join(sentences))
+    return texts
+
+
+def docs_per_sec(run, texts) -> float:
+    start = time.perf_counter()
+    run(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_process = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    texts = sample_texts(count)
+
+    full = AyurvedaSpider.build_nlp('full')
+    lean = AyurvedaSpider.build_nlp('lean')
+
+    results = [
+        ('full, nlp() per doc', docs_per_sec(lambda ts: [full(t) for t in ts], texts)),
+        ('full, nlp.pipe', docs_per_sec(lambda ts: list(full.pipe(ts, batch_size=64)), texts)),
+        ('lean, nlp() per doc', docs_per_sec(lambda ts: [lean(t) for t in ts], texts)),
+        (f'lean, nlp.pipe n_process={n_process}',
+         docs_per_sec(lambda ts: list(lean.pipe(ts, n_process=n_process, batch_size=64)), texts)),
+    ]
+    baseline = results[0][1]
+    print(f"{count} documents")
+    for name, rate in results:
+        print(f"  {name:32} {rate:10,.0f} docs/sec  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark treatment enrichment on a large synthetic disease dataset.
+
+Runs the per-disease template loop add_comprehensive_treatments() used
+before against treatment_templates.enrich_treatments() on 100k diseases by
+default (single-dosha only, so both produce the same JSON, which is
+checked), and reports the best time per record over several untraced runs
+and, from a separate run, the memory each allocates for its output,
+measured with tracemalloc. Timings vary by a few us/record between runs;
+compare the two rows of one run rather than figures from different runs.
+
+Usage: python benchmark_treatment_templates.py [diseases] [repeats]
+"""
+
+import copy
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from treatment_templates import DEFAULT_PRECAUTIONS, TREATMENT_TEMPLATES, enrich_treatments
+
+
+def make_diseases(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    doshas = list(TREATMENT_TEMPLATES) + ['Tridosha']
+    return [{'name': f"Disease {i}", 'dosha': [rng.choice(doshas)] if rng.random() < 0.9 else [],
+             'symptoms': ['pain'], 'treatments': [] if rng.random() < 0.7 else [{'type': 'Diet'}]}
+            for i in range(count)]
+
+
+def legacy_add_treatments(diseases):
+    """The per-disease loop add_comprehensive_treatments used before"""
+    for disease in diseases:
+        if not disease.get('treatments'):
+            disease['treatments'] = []
+        primary_dosha = disease.get('dosha', [])
+        if isinstance(primary_dosha, list) and primary_dosha:
+            dosha = primary_dosha[0]
+            if dosha in TREATMENT_TEMPLATES:
+                template = TREATMENT_TEMPLATES[dosha]
+                if template['herbs']:
+                    disease['treatments'].append({
+                        'type': 'Herbal',
+                        'description': f'Traditional {dosha} balancing herbs',
+                        'ingredients': template['herbs'][:3],
+                        'source': 'Classical Ayurvedic texts',
+                        'dosage': 'As prescribed by qualified practitioner',
+                        'duration': '3-6 months',
+                        'note': 'Consult with Ayurvedic practitioner for proper dosage and preparation'
+                    })
+                if template['therapies']:
+                    disease['treatments'].append({
+                        'type': 'Therapy',
+                        'description': f'{dosha} balancing therapies',
+                        'ingredients': template['therapies'],
+                        'source': 'Classical Ayurvedic texts',
+                        'procedure': 'Performed by qualified therapist',
+                        'frequency': 'As recommended by practitioner',
+                        'note': 'Should be performed under professional supervision'
+                    })
+        if not disease.get('lifestyle'):
+            disease['lifestyle'] = []
+        if not disease.get('precautions'):
+            disease['precautions'] = list(DEFAULT_PRECAUTIONS)
+    return diseases
+
+
+def measure(fn, diseases, repeats):
+    # Each run gets a fresh copy, since the legacy loop mutates its input
+    best = float('inf')
+    for _ in range(repeats):
+        data = copy.deepcopy(diseases)
+        start = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - start)
+
+    # Allocation is measured on its own, since tracing slows the run down
+    data = copy.deepcopy(diseases)
+    tracemalloc.start()
+    result = fn(data)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, best, allocated
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    diseases = make_diseases(count)
+
+    legacy, legacy_seconds, legacy_bytes = measure(legacy_add_treatments, diseases, repeats)
+    enriched, seconds, allocated = measure(enrich_treatments, diseases, repeats)
+    if json.dumps(legacy) != json.dumps(enriched):
+        raise SystemExit("enrich_treatments output differs from the legacy loop")
+
+    print(f"{count:,} diseases, best of {repeats}")
+    for label, secs, size in (('per-disease loop', legacy_seconds, legacy_bytes),
+                              ('enrich_treatments', seconds, allocated)):
+        print(f"  {label:18} {secs:7.3f}s  {secs / count * 1e6:6.2f} us/record  "
+              f"{size / 1e6:7.1f} MB  ({size / count:5.0f} B/record)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,17 @@ Comprehensive Yoga Data Extraction from David Frawley PDF
 Extracts all yoga poses, sequences, pranayama, and therapeutic information
 """
 
-import PyPDF2
 import re
 import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from PDF file"""
+from pdf_extraction import extract_text
+
+def extract_text_from_pdf(pdf_path: str, workers: Optional[int] = None) -> str:
+    """Extract text from PDF file, spreading pages across `workers` processes"""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+        return extract_text(pdf_path, backend='pypdf2', workers=workers)
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return ""
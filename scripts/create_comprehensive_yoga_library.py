@@ -9,6 +9,8 @@ import os
 from pathlib import Path
 from typing import Dict, List, Any
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class ComprehensiveYogaLibrary:
     def __init__(self):
         self.yoga_poses = []
@@ -818,7 +820,7 @@ class ComprehensiveYogaLibrary:
         }
         
         # Save to file
-        output_path = "/Users/god/Downloads/Mero pahichan/src/assets/comprehensive_yoga_library.json"
+        output_path = os.path.join(REPO_ROOT, 'src', 'assets', 'comprehensive_yoga_library.json')
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(comprehensive_data, f, indent=2, ensure_ascii=False)
         
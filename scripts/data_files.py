@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Helpers for reading and writing the files the data scripts produce.
+
+Outputs are written through atomic_open(), which writes a temporary file next
+to the target and renames it over the target only once it is complete, so a
+reader (or a crashed run) never leaves a half-written JSON file behind.
+write_json_array() streams records into a JSON array one at a time, so a
+script can write its output as records are produced instead of collecting
+them in a list first.
+"""
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, List, Optional
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hash a file's contents without loading it into memory at once"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'w', encoding: str = 'utf-8',
+                newline: Optional[str] = None) -> Iterator[IO]:
+    """Open path for writing; the file replaces path when the block exits without an error"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    binary = 'b' in mode
+    try:
+        with open(tmp_path, mode, encoding=None if binary else encoding,
+                  newline=None if binary else newline) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_array(f: IO, records: Iterable, ensure_ascii: bool = True) -> int:
+    """
+    Write records to f as a JSON array, one at a time, with the same layout as
+    json.dump(list(records), f, indent=2, ensure_ascii=ensure_ascii). Returns
+    the number of records written.
+    """
+    count = 0
+    f.write('[')
+    for record in records:
+        body = json.dumps(record, indent=2, ensure_ascii=ensure_ascii).replace('\n', '\n  ')
+        f.write((',\n  ' if count else '\n  ') + body)
+        count += 1
+    f.write('\n]' if count else ']')
+    return count
+
+
+def keep_first(records: Iterable, kept: List, size: int) -> Iterator:
+    """Pass records through unchanged, appending the first `size` of them to kept"""
+    for record in records:
+        if len(kept) < size:
+            kept.append(record)
+        yield record
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection and merging for crawled disease records.
+
+The same disease is mined from several mirrors of a text (and from the sample
+datasets), so records are grouped by a normalized name (falling back to the
+Sanskrit name) and compared by a 64-bit SimHash of their content: symptoms,
+treatments, herbs and pathogenesis. Records whose fingerprints differ in at
+most MAX_DISTANCE bits are merged into the first one seen. Records with no
+usable name (missing, 'Unknown' or 'Not specified') are never merged: sharing
+an empty key says nothing about being the same disease.
+
+Candidates are found through banded lookups: the fingerprint is split into
+BANDS pieces, and two fingerprints within MAX_DISTANCE bits must agree on at
+least one piece, so each record is only compared against the few records
+sharing a (name, band) bucket. Deduplicating n records takes O(n) expected time.
+"""
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+
+FINGERPRINT_BITS = 64
+BANDS = 8
+BAND_BITS = FINGERPRINT_BITS // BANDS
+# Fewer differing bits than bands guarantees a shared band (pigeonhole)
+MAX_DISTANCE = BANDS - 2
+
+PLACEHOLDERS = {'not specified', 'unknown', ''}
+LIST_FIELDS = ('symptoms', 'herbs', 'precautions', 'diet', 'lifestyle')
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def normalize_name(name: Any) -> str:
+    """Casefolded name without diacritics, punctuation or spacing"""
+    if not isinstance(name, str):
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ''.join(ch for ch in stripped.casefold() if ch.isalnum())
+
+
+def record_key(record: Dict[str, Any]) -> str:
+    """Normalized name, else Sanskrit name; '' when the record has neither"""
+    for field in ('name', 'sanskrit'):
+        key = normalize_name(record.get(field))
+        if key not in ('unknown', 'notspecified', ''):
+            return key
+    return ''
+
+
+def _iter_text(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_text(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_text(item)
+
+
+@lru_cache(maxsize=65536)
+def _token_vector(token: str) -> Tuple[int, ...]:
+    """+1/-1 per fingerprint bit, from the token's hash"""
+    h = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+    return tuple(1 if h >> bit & 1 else -1 for bit in range(FINGERPRINT_BITS))
+
+
+def simhash(record: Dict[str, Any]) -> int:
+    """64-bit SimHash over the record's content tokens"""
+    tokens = Counter()
+    for field in ('symptoms', 'treatments', 'herbs', 'pathogenesis'):
+        for text in _iter_text(record.get(field)):
+            if text.strip().lower() not in PLACEHOLDERS:
+                tokens.update(_TOKEN_RE.findall(text.lower()))
+    if not tokens:
+        return 0
+    # Column sums of the token vectors, each repeated by its count
+    weights = map(sum, zip(*(_token_vector(token) for token in tokens.elements())))
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _bands(fingerprint: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [fingerprint >> (i * BAND_BITS) & mask for i in range(BANDS)]
+
+
+def _merge_list(existing: List[Any], extra: List[Any]) -> List[Any]:
+    merged = list(existing or [])
+    for item in extra or []:
+        if item not in merged:
+            merged.append(item)
+    real = [item for item in merged if not (isinstance(item, str) and item.strip().lower() in PLACEHOLDERS)]
+    return real or merged[:1]
+
+
+def merge_records(target: Dict[str, Any], duplicate: Dict[str, Any]):
+    """Fold a duplicate's list fields and treatments into target, in place"""
+    for field in LIST_FIELDS:
+        if isinstance(target.get(field), list) and isinstance(duplicate.get(field), list):
+            target[field] = _merge_list(target[field], duplicate[field])
+    treatments = list(target.get('treatments') or [])
+    seen = {(t.get('type'), t.get('description')) for t in treatments if isinstance(t, dict)}
+    for treatment in duplicate.get('treatments') or []:
+        if isinstance(treatment, dict) and (treatment.get('type'), treatment.get('description')) not in seen:
+            seen.add((treatment.get('type'), treatment.get('description')))
+            treatments.append(treatment)
+    if treatments:
+        target['treatments'] = treatments
+    for field in ('pathogenesis', 'modernEquivalent', 'sanskrit'):
+        if str(target.get(field, '')).strip().lower() in PLACEHOLDERS and duplicate.get(field):
+            target[field] = duplicate[field]
+
+
+def dedupe_diseases(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the records with near-duplicates merged into their first occurrence"""
+    kept: List[Dict[str, Any]] = []
+    fingerprints: List[int] = []
+    buckets: Dict[tuple, List[int]] = {}
+
+    for record in records:
+        key = record_key(record)
+        if not key:
+            kept.append(dict(record))
+            fingerprints.append(0)
+            continue
+        fingerprint = simhash(record)
+        bands = _bands(fingerprint)
+
+        match = None
+        for band, value in enumerate(bands):
+            for candidate in buckets.get((key, band, value), ()):
+                if bin(fingerprints[candidate] ^ fingerprint).count('1') <= MAX_DISTANCE:
+                    match = candidate
+                    break
+            if match is not None:
+                break
+
+        if match is not None:
+            merge_records(kept[match], record)
+            continue
+
+        index = len(kept)
+        kept.append(dict(record))
+        fingerprints.append(fingerprint)
+        for band, value in enumerate(bands):
+            buckets.setdefault((key, band, value), []).append(index)
+
+    return kept
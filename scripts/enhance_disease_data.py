@@ -4,274 +4,221 @@ Script to extract and enhance disease data from Ayurvedic PDF files
 """
 
 import json
-import re
 from pathlib import Path
-import PyPDF2
-import spacy
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
-# Load English language model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Please install the English language model: python -m spacy download en_core_web_sm")
-    exit(1)
+from mention_scanner import MentionScanner
+from pdf_extraction import extract_text
+from sanskrit_names import NameIndex
+from treatment_templates import enrich_treatments
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from PDF file"""
+def extract_text_from_pdf(pdf_path: str, workers: Optional[int] = None) -> str:
+    """Extract text from PDF file, spreading pages across `workers` processes"""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+        return extract_text(pdf_path, backend='pypdf2', workers=workers)
     except Exception as e:
         print(f"Error reading PDF {pdf_path}: {e}")
         return ""
 
+# Common Ayurvedic disease patterns. The lookbehinds only skip starts where a
+# leftmost match can never begin: inside a word, or (for the capitalized
+# phrase) at a word whose preceding word would already have matched
+DISEASE_PATTERNS = [
+    r'(?<!\w)(\w+)\s*\(([^).]+)\)',  # Disease (Sanskrit name)
+    r'(?<![A-Z])(?<![A-Z][a-z]\s)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*-\s*([^.]*)',  # Disease - description
+    r'(?<!\w)(\w+)\s*:\s*([^.]*)',  # Disease: description
+]
+
+# Ayurvedic terms and their English equivalents
+AYURVEDIC_TERMS = {
+    'amavata': 'Rheumatoid Arthritis',
+    'amlapitta': 'Hyperacidity/GERD',
+    'sandhivata': 'Osteoarthritis',
+    'sthulya': 'Obesity',
+    'madhumeha': 'Diabetes',
+    'shwasa': 'Asthma',
+    'kasa': 'Cough',
+    'atisara': 'Diarrhea',
+    'arsha': 'Hemorrhoids',
+    'kushtha': 'Skin Diseases',
+    'shiroroga': 'Headache',
+    'netraroga': 'Eye Diseases',
+    'karnaroga': 'Ear Diseases',
+    'hridroga': 'Heart Disease',
+    'kamala': 'Jaundice',
+    'pandu': 'Anemia',
+    'unmada': 'Mental Disorders',
+    'apasmara': 'Epilepsy',
+    'anidra': 'Insomnia',
+    'gridhrasi': 'Sciatica',
+    'bhagandara': 'Fistula',
+    'granthi': 'Tumors/Lumps',
+    'gulma': 'Abdominal Mass',
+    'mutradosha': 'Urinary Disorders',
+    'mutrakricchra': 'Dysuria',
+    'mutraghata': 'Urinary Retention',
+    'chardi': 'Vomiting',
+    'hikka': 'Hiccups',
+    'trishna': 'Excessive Thirst',
+    'jwara': 'Fever',
+    'rajayakshma': 'Tuberculosis',
+    'kshaya': 'Emaciation',
+    'dadhru': 'Ringworm',
+    'vandhyatva': 'Infertility',
+    'artava dosha': 'Menstrual Disorders',
+    'phiranga': 'Syphilis',
+    'udara': 'Abdominal Diseases',
+    'nasaroga': 'Nasal Disorders',
+    'karnashula': 'Ear Pain',
+    'netra roga': 'Eye Diseases',
+}
+
+# Dosha patterns
+DOSHA_PATTERNS = {
+    'vata': ['vata', 'vayu', 'wind', 'air'],
+    'pitta': ['pitta', 'fire', 'bile', 'heat'],
+    'kapha': ['kapha', 'phlegm', 'mucus', 'water', 'earth']
+}
+
+# Treatment patterns
+TREATMENT_PATTERNS = {
+    'herbal': ['herb', 'plant', 'leaf', 'root', 'bark', 'flower', 'seed'],
+    'therapy': ['massage', 'oil', 'steam', 'bath', 'therapy'],
+    'surgical': ['surgery', 'operation', 'procedure', 'surgical'],
+    'dietary': ['diet', 'food', 'nutrition', 'eating'],
+    'lifestyle': ['exercise', 'yoga', 'meditation', 'sleep', 'routine']
+}
+
+# Patterns never match across '.', so one pass over the text finds the same
+# mentions as running them sentence by sentence
+SCANNER = MentionScanner(DISEASE_PATTERNS, {'dosha': DOSHA_PATTERNS, 'treatment': TREATMENT_PATTERNS})
+
+def _union(existing: List[Any], extra: List[Any]) -> List[Any]:
+    merged = list(existing)
+    merged.extend(item for item in extra if item not in existing)
+    return merged
+
+class DiseaseAccumulator:
+    """
+    Ordered collection of extracted disease records, unique by exact name.
+    Membership is a dict lookup; a record whose name is already present has
+    its list fields (doshas, treatment types) unioned into the first one.
+    """
+
+    def __init__(self, merge_fields: Tuple[str, ...] = ('dosha', 'treatmentTypes')):
+        self.merge_fields = merge_fields
+        self.records: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Add a record or merge it into the existing one; True if it was new"""
+        existing = self._by_name.get(record['name'])
+        if existing is None:
+            self._by_name[record['name']] = record
+            self.records.append(record)
+            return True
+        for field in self.merge_fields:
+            if record.get(field):
+                existing[field] = _union(existing.get(field) or [], record[field])
+        return False
+
 def extract_disease_info_from_text(text: str) -> List[Dict[str, Any]]:
     """Extract disease information from text using NLP and pattern matching"""
     
-    # Common Ayurvedic disease patterns
-    disease_patterns = [
-        r'(\w+)\s*\(([^)]+)\)',  # Disease (Sanskrit name)
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*-\s*([^.]*)',  # Disease - description
-        r'(\w+)\s*:\s*([^.]*)',  # Disease: description
-    ]
-    
-    # Ayurvedic terms and their English equivalents
-    ayurvedic_terms = {
-        'amavata': 'Rheumatoid Arthritis',
-        'amlapitta': 'Hyperacidity/GERD',
-        'sandhivata': 'Osteoarthritis',
-        'sthulya': 'Obesity',
-        'madhumeha': 'Diabetes',
-        'shwasa': 'Asthma',
-        'kasa': 'Cough',
-        'atisara': 'Diarrhea',
-        'arsha': 'Hemorrhoids',
-        'kushtha': 'Skin Diseases',
-        'shiroroga': 'Headache',
-        'netraroga': 'Eye Diseases',
-        'karnaroga': 'Ear Diseases',
-        'hridroga': 'Heart Disease',
-        'kamala': 'Jaundice',
-        'pandu': 'Anemia',
-        'unmada': 'Mental Disorders',
-        'apasmara': 'Epilepsy',
-        'anidra': 'Insomnia',
-        'gridhrasi': 'Sciatica',
-        'bhagandara': 'Fistula',
-        'granthi': 'Tumors/Lumps',
-        'gulma': 'Abdominal Mass',
-        'mutradosha': 'Urinary Disorders',
-        'mutrakricchra': 'Dysuria',
-        'mutraghata': 'Urinary Retention',
-        'chardi': 'Vomiting',
-        'hikka': 'Hiccups',
-        'trishna': 'Excessive Thirst',
-        'jwara': 'Fever',
-        'rajayakshma': 'Tuberculosis',
-        'kshaya': 'Emaciation',
-        'dadhru': 'Ringworm',
-        'vandhyatva': 'Infertility',
-        'artava dosha': 'Menstrual Disorders',
-        'phiranga': 'Syphilis',
-        'udara': 'Abdominal Diseases',
-        'nasaroga': 'Nasal Disorders',
-        'karnashula': 'Ear Pain',
-        'netra roga': 'Eye Diseases',
-    }
-    
-    # Dosha patterns
-    dosha_patterns = {
-        'vata': ['vata', 'vayu', 'wind', 'air'],
-        'pitta': ['pitta', 'fire', 'bile', 'heat'],
-        'kapha': ['kapha', 'phlegm', 'mucus', 'water', 'earth']
-    }
-    
-    # Treatment patterns
-    treatment_patterns = {
-        'herbal': ['herb', 'plant', 'leaf', 'root', 'bark', 'flower', 'seed'],
-        'therapy': ['massage', 'oil', 'steam', 'bath', 'therapy'],
-        'surgical': ['surgery', 'operation', 'procedure', 'surgical'],
-        'dietary': ['diet', 'food', 'nutrition', 'eating'],
-        'lifestyle': ['exercise', 'yoga', 'meditation', 'sleep', 'routine']
-    }
-    
     # Extract sentences containing disease-related terms
-    sentences = text.split('.')
-    disease_info = []
+    disease_info = DiseaseAccumulator()
     
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if len(sentence) < 20:  # Skip very short sentences
-            continue
+    for found in SCANNER.scan(text):
+        doshas = [dosha.capitalize() for dosha in found.tags['dosha']]
+        treatment_types = [treatment_type.capitalize() for treatment_type in found.tags['treatment']]
+        
+        # Disease mentions, in pattern order
+        for _, match in found.mentions:
+            disease_name = match[0].strip()
+            description = match[1].strip()
+            
+            # Skip if too short or common words
+            if len(disease_name) < 3 or disease_name.lower() in ['the', 'and', 'or', 'but', 'in', 'on', 'at']:
+                continue
+            
+            # Check if it's a known Ayurvedic term
+            english_name = AYURVEDIC_TERMS.get(disease_name.lower(), disease_name)
+            
+            # Create disease info
+            disease_data = {
+                'name': disease_name,
+                'sanskrit': disease_name if disease_name.lower() in AYURVEDIC_TERMS else '',
+                'englishName': english_name,
+                'description': description,
+                'dosha': list(doshas),
+                'treatmentTypes': list(treatment_types),
+                'source': 'Extracted from Ayurvedic texts',
+                'severity': 'Moderate',
+                'category': 'General',
+                'symptoms': [],
+                'causes': [],
+                'treatments': [],
+                'diet': {'include': [], 'avoid': []},
+                'lifestyle': [],
+                'precautions': []
+            }
             
-        # Check for disease patterns
-        for pattern in disease_patterns:
-            matches = re.findall(pattern, sentence, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    disease_name = match[0].strip()
-                    description = match[1].strip()
-                else:
-                    disease_name = match.strip()
-                    description = sentence
-                
-                # Skip if too short or common words
-                if len(disease_name) < 3 or disease_name.lower() in ['the', 'and', 'or', 'but', 'in', 'on', 'at']:
-                    continue
-                
-                # Check if it's a known Ayurvedic term
-                english_name = ayurvedic_terms.get(disease_name.lower(), disease_name)
-                
-                # Extract doshas mentioned
-                doshas = []
-                for dosha, keywords in dosha_patterns.items():
-                    if any(keyword in sentence.lower() for keyword in keywords):
-                        doshas.append(dosha.capitalize())
-                
-                # Extract treatment types
-                treatment_types = []
-                for treatment_type, keywords in treatment_patterns.items():
-                    if any(keyword in sentence.lower() for keyword in keywords):
-                        treatment_types.append(treatment_type.capitalize())
-                
-                # Create disease info
-                disease_data = {
-                    'name': disease_name,
-                    'sanskrit': disease_name if disease_name.lower() in ayurvedic_terms else '',
-                    'englishName': english_name,
-                    'description': description,
-                    'dosha': doshas,
-                    'treatmentTypes': treatment_types,
-                    'source': 'Extracted from Ayurvedic texts',
-                    'severity': 'Moderate',
-                    'category': 'General',
-                    'symptoms': [],
-                    'causes': [],
-                    'treatments': [],
-                    'diet': {'include': [], 'avoid': []},
-                    'lifestyle': [],
-                    'precautions': []
-                }
-                
-                # Add to list if not already present
-                existing_names = [d['name'] for d in disease_info]
-                if disease_name not in existing_names:
-                    disease_info.append(disease_data)
+            # Add to list, or merge doshas/treatment types into the earlier mention
+            disease_info.add(disease_data)
     
-    return disease_info
+    return disease_info.records
 
 def enhance_existing_diseases(existing_diseases: List[Dict], extracted_info: List[Dict]) -> List[Dict]:
-    """Enhance existing disease data with extracted information"""
+    """
+    Enhance existing disease data with extracted information. Each disease
+    takes the first extracted record with the same name or Sanskrit name,
+    compared through transliteration-insensitive keys (see sanskrit_names.py),
+    so matching is one index build plus one lookup per disease.
+    """
     
+    index = NameIndex(extracted_info)
     enhanced_diseases = []
     
     for disease in existing_diseases:
         enhanced_disease = disease.copy()
         
         # Find matching extracted info
-        for extracted in extracted_info:
-            if (disease['name'].lower() == extracted['name'].lower() or 
-                disease['sanskrit'] and disease['sanskrit'].lower() == extracted['sanskrit'].lower()):
-                
-                # Enhance with extracted information
-                if not enhanced_disease.get('description') and extracted.get('description'):
-                    enhanced_disease['description'] = extracted['description']
-                
-                if not enhanced_disease.get('dosha') and extracted.get('dosha'):
-                    enhanced_disease['dosha'] = extracted['dosha']
-                
-                if not enhanced_disease.get('causes') and extracted.get('causes'):
-                    enhanced_disease['causes'] = extracted['causes']
-                
-                if not enhanced_disease.get('symptoms') and extracted.get('symptoms'):
-                    enhanced_disease['symptoms'] = extracted['symptoms']
-                
-                # Add treatment types if not present
-                if extracted.get('treatmentTypes') and not enhanced_disease.get('treatmentTypes'):
-                    enhanced_disease['treatmentTypes'] = extracted['treatmentTypes']
-                
-                break
+        extracted = index.find(disease)
+        if extracted is not None:
+            # Enhance with extracted information
+            if not enhanced_disease.get('description') and extracted.get('description'):
+                enhanced_disease['description'] = extracted['description']
+            
+            if not enhanced_disease.get('dosha') and extracted.get('dosha'):
+                enhanced_disease['dosha'] = extracted['dosha']
+            
+            if not enhanced_disease.get('causes') and extracted.get('causes'):
+                enhanced_disease['causes'] = extracted['causes']
+            
+            if not enhanced_disease.get('symptoms') and extracted.get('symptoms'):
+                enhanced_disease['symptoms'] = extracted['symptoms']
+            
+            # Add treatment types if not present
+            if extracted.get('treatmentTypes') and not enhanced_disease.get('treatmentTypes'):
+                enhanced_disease['treatmentTypes'] = extracted['treatmentTypes']
         
         enhanced_diseases.append(enhanced_disease)
     
     return enhanced_diseases
 
 def add_comprehensive_treatments(diseases: List[Dict]) -> List[Dict]:
-    """Add comprehensive treatment information based on disease type"""
-    
-    # Treatment templates based on dosha and category
-    treatment_templates = {
-        'Vata': {
-            'herbs': ['Ashwagandha', 'Brahmi', 'Jatamansi', 'Shankhpushpi', 'Sesame oil'],
-            'therapies': ['Abhyanga (oil massage)', 'Shirodhara', 'Basti (enema)', 'Nasya'],
-            'lifestyle': ['Regular routine', 'Warm foods', 'Gentle exercise', 'Adequate sleep']
-        },
-        'Pitta': {
-            'herbs': ['Neem', 'Amla', 'Yashtimadhu', 'Shatavari', 'Guduchi'],
-            'therapies': ['Sheetali pranayama', 'Cooling therapies', 'Virechana'],
-            'lifestyle': ['Cool environment', 'Sweet foods', 'Moderate exercise', 'Stress management']
-        },
-        'Kapha': {
-            'herbs': ['Guggulu', 'Triphala', 'Ginger', 'Pippali', 'Haritaki'],
-            'therapies': ['Udvartana', 'Vamana', 'Svedana'],
-            'lifestyle': ['Regular exercise', 'Light foods', 'Early rising', 'Stimulation']
-        }
-    }
-    
-    for disease in diseases:
-        if not disease.get('treatments'):
-            disease['treatments'] = []
-        
-        # Add treatments based on primary dosha
-        primary_dosha = disease.get('dosha', [])
-        if isinstance(primary_dosha, list) and primary_dosha:
-            dosha = primary_dosha[0]
-            if dosha in treatment_templates:
-                template = treatment_templates[dosha]
-                
-                # Add herbal treatment
-                if template['herbs']:
-                    disease['treatments'].append({
-                        'type': 'Herbal',
-                        'description': f'Traditional {dosha} balancing herbs',
-                        'ingredients': template['herbs'][:3],  # Take first 3 herbs
-                        'source': 'Classical Ayurvedic texts',
-                        'dosage': 'As prescribed by qualified practitioner',
-                        'duration': '3-6 months',
-                        'note': 'Consult with Ayurvedic practitioner for proper dosage and preparation'
-                    })
-                
-                # Add therapy treatment
-                if template['therapies']:
-                    disease['treatments'].append({
-                        'type': 'Therapy',
-                        'description': f'{dosha} balancing therapies',
-                        'ingredients': template['therapies'],
-                        'source': 'Classical Ayurvedic texts',
-                        'procedure': 'Performed by qualified therapist',
-                        'frequency': 'As recommended by practitioner',
-                        'note': 'Should be performed under professional supervision'
-                    })
-        
-        # Add lifestyle recommendations
-        if not disease.get('lifestyle'):
-            disease['lifestyle'] = []
-        
-        # Add precautions
-        if not disease.get('precautions'):
-            disease['precautions'] = [
-                'Consult qualified Ayurvedic practitioner',
-                'Follow prescribed dosage and duration',
-                'Monitor for any adverse reactions',
-                'Maintain healthy lifestyle practices'
-            ]
-    
-    return diseases
+    """
+    Add comprehensive treatment information based on the diseases' doshas.
+    Template payloads are built once per dosha signature and copied into each
+    disease (see treatment_templates.py); enriched copies are returned.
+    """
+    return enrich_treatments(diseases)
 
 def main():
     """Main function to process PDF files and enhance disease data"""
@@ -1,49 +1,56 @@
-import pdfplumber
 import re
-import json
 import os
-from typing import List, Dict, Any
+from typing import Iterator, Dict, Any
+
+from data_files import atomic_open, keep_first, write_json_array
+from instrumentation import get_profiler
+from lad_classifier import KeywordClassifier
+from lad_sections import iter_heading_sections, iter_lines
+from pdf_extraction import iter_pages
 
 PDF_PATH = "The_Complete_Book_of_Ayurvedic_Home_Remedies.pdf"
 OUTPUT_JSON = os.path.join(os.path.dirname(__file__), '../backend/data/diseases_lad_comprehensive.json')
 
-def extract_diseases_from_lad_pdf():
+PROFILE = get_profiler('extract_lad_diseases_comprehensive')
+
+DOSHA_KEYWORDS = {
+    'Vata': ['dry', 'cold', 'light', 'mobile', 'rough', 'constipation', 'anxiety', 'insomnia', 'pain'],
+    'Pitta': ['hot', 'burning', 'sharp', 'acidic', 'inflammation', 'fever', 'anger', 'irritation'],
+    'Kapha': ['heavy', 'cold', 'oily', 'sweet', 'sticky', 'congestion', 'lethargy', 'weight gain']
+}
+
+CATEGORY_KEYWORDS = {
+    'Digestive': ['stomach', 'digestion', 'appetite', 'nausea', 'vomiting', 'diarrhea', 'constipation'],
+    'Respiratory': ['cough', 'breathing', 'asthma', 'bronchitis', 'cold', 'sinus'],
+    'Skin': ['skin', 'rash', 'itching', 'eczema', 'psoriasis', 'acne'],
+    'Mental Health': ['anxiety', 'depression', 'stress', 'insomnia', 'mood'],
+    'Cardiovascular': ['heart', 'blood pressure', 'chest pain', 'palpitation'],
+    'Joints': ['joint', 'arthritis', 'pain', 'stiffness', 'swelling'],
+    'Neurological': ['headache', 'migraine', 'numbness', 'paralysis', 'seizure'],
+    'Endocrine': ['diabetes', 'thyroid', 'hormone', 'sugar'],
+    'Urogenital': ['urine', 'kidney', 'bladder', 'prostate', 'menstrual'],
+    'Eye': ['eye', 'vision', 'blindness', 'cataract'],
+    'Ear': ['ear', 'hearing', 'tinnitus', 'deafness'],
+    'Dental': ['tooth', 'dental', 'gum', 'mouth']
+}
+
+# Scores dosha and category together, see lad_classifier.py
+CLASSIFIER = KeywordClassifier(DOSHA_KEYWORDS, CATEGORY_KEYWORDS)
+
+def iter_lad_diseases(lines) -> Iterator[Dict[str, Any]]:
     """
-    Extract all diseases from Dr. Vasant Lad's "The Complete Book of Ayurvedic Home Remedies"
+    Yield each disease as soon as the next accepted heading closes its section
     """
-    print("Extracting diseases from Dr. Lad's PDF...")
-    
-    diseases = []
     disease_id_counter = 1
     
-    with pdfplumber.open(PDF_PATH) as pdf:
-        # Extract text from the encyclopedia section (starting around page 120)
-        text = ""
-        for i in range(120, len(pdf.pages)):
-            page_text = pdf.pages[i].extract_text()
-            if page_text:
-                text += page_text + "\n"
-    
-    # Find the start of the disease encyclopedia
-    # Look for common disease patterns
-    disease_patterns = [
-        r"\n([A-Z][a-zA-Z\s\-\(\)\/]+)\n(?:Symptoms?|Causes?|Treatment|Remedy|Diet|Lifestyle)",
-        r"\n([A-Z][a-zA-Z\s\-\(\)\/]+)\n(?:[A-Z][a-z]+:)", 
-    ]
-    
     # Split text into potential disease sections
-    sections = re.split(r"\n([A-Z][A-Z\s\-\(\)\/]+)\n", text)
-    
     current_disease = None
-    current_content = ""
+    current_content = []
     
-    for i, section in enumerate(sections):
-        if i % 2 == 0:  # Content
-            if current_disease:
-                current_content += section
-        else:  # Potential disease name
+    for section_heading, section in PROFILE.iterate('segmentation', iter_heading_sections(lines, r"A-Z\s\-\(\)\/")):
+        if section_heading is not None:  # Potential disease name
             # Check if this looks like a disease name
-            disease_name = section.strip()
+            disease_name = section_heading.strip()
             
             # Skip if it's clearly not a disease
             skip_keywords = [
@@ -53,35 +60,50 @@ def extract_diseases_from_lad_pdf():
                 'BLOOD', 'BASTI', 'THERAPY', 'HEALING'
             ]
             
-            if any(keyword in disease_name.upper() for keyword in skip_keywords):
-                continue
+            if not any(keyword in disease_name.upper() for keyword in skip_keywords):
+                # If we have a previous disease, emit it
+                if current_disease and ''.join(current_content).strip():
+                    disease_data = parse_disease_content(current_disease, ''.join(current_content), disease_id_counter)
+                    if disease_data:
+                        yield disease_data
+                        disease_id_counter += 1
                 
-            # If we have a previous disease, save it
-            if current_disease and current_content.strip():
-                disease_data = parse_disease_content(current_disease, current_content, disease_id_counter)
-                if disease_data:
-                    diseases.append(disease_data)
-                    disease_id_counter += 1
-            
-            # Start new disease
-            current_disease = disease_name
-            current_content = ""
+                # Start new disease
+                current_disease = disease_name
+                current_content = []
+        
+        # Content (skipped headings fold their content into the current disease)
+        if current_disease:
+            current_content.append(section)
     
     # Don't forget the last disease
-    if current_disease and current_content.strip():
-        disease_data = parse_disease_content(current_disease, current_content, disease_id_counter)
+    if current_disease and ''.join(current_content).strip():
+        disease_data = parse_disease_content(current_disease, ''.join(current_content), disease_id_counter)
         if disease_data:
-            diseases.append(disease_data)
+            yield disease_data
+
+def extract_diseases_from_lad_pdf(sample_size: int = 5):
+    """
+    Extract all diseases from Dr. Vasant Lad's "The Complete Book of Ayurvedic Home Remedies"
+    """
+    print("Extracting diseases from Dr. Lad's PDF...")
     
-    print(f"Extracted {len(diseases)} diseases from Dr. Lad's book")
+    # Stream the encyclopedia section (starting around page 120) page by page
+    lines = iter_lines(PROFILE.iterate('pdf_extraction', iter_pages(PDF_PATH, start_page=120)))
+    diseases = PROFILE.iterate('iter_lad_diseases', iter_lad_diseases(lines))
     
     # Save to JSON
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(diseases, f, indent=2, ensure_ascii=False)
+    sample = []
+    with PROFILE.span('json_write') as stats, atomic_open(OUTPUT_JSON) as f:
+        count = write_json_array(f, keep_first(diseases, sample, sample_size), ensure_ascii=False)
+        stats.records_in += count
     
+    print(f"Extracted {count} diseases from Dr. Lad's book")
     print(f"Saved to {OUTPUT_JSON}")
-    return diseases
+    PROFILE.write_report()
+    return count, sample
 
+@PROFILE.timed('parse_disease_content')
 def parse_disease_content(disease_name: str, content: str, disease_id: int) -> Dict[str, Any]:
     """
     Parse disease content and extract structured information
@@ -166,11 +188,10 @@ def parse_disease_content(disease_name: str, content: str, disease_id: int) -> D
             lifestyle = [l.strip() for l in re.split(r'[;,\n]', lifestyle_text) if l.strip()]
             break
     
-    # Determine dosha based on symptoms and content
-    dosha = determine_dosha(symptoms, causes, content)
-    
-    # Determine category based on disease name and symptoms
-    category = determine_category(disease_name, symptoms)
+    # Determine dosha (symptoms and content) and category (name and symptoms) in one pass
+    with PROFILE.span('classification', records_in=1):
+        labels = CLASSIFIER.classify(disease_name, symptoms, causes, content)
+    dosha, category = labels['dosha'], labels['category']
     
     # Create disease object
     disease_data = {
@@ -197,61 +218,9 @@ def parse_disease_content(disease_name: str, content: str, disease_id: int) -> D
     
     return disease_data
 
-def determine_dosha(symptoms: List[str], causes: List[str], content: str) -> List[str]:
-    """
-    Determine dosha based on symptoms, causes, and content
-    """
-    dosha_keywords = {
-        'Vata': ['dry', 'cold', 'light', 'mobile', 'rough', 'constipation', 'anxiety', 'insomnia', 'pain'],
-        'Pitta': ['hot', 'burning', 'sharp', 'acidic', 'inflammation', 'fever', 'anger', 'irritation'],
-        'Kapha': ['heavy', 'cold', 'oily', 'sweet', 'sticky', 'congestion', 'lethargy', 'weight gain']
-    }
-    
-    text = ' '.join(symptoms + causes + [content]).lower()
-    dosha_scores = {'Vata': 0, 'Pitta': 0, 'Kapha': 0}
-    
-    for dosha, keywords in dosha_keywords.items():
-        for keyword in keywords:
-            if keyword in text:
-                dosha_scores[dosha] += 1
-    
-    # Return doshas with highest scores
-    max_score = max(dosha_scores.values())
-    if max_score == 0:
-        return ['Vata']  # Default
-    
-    return [dosha for dosha, score in dosha_scores.items() if score == max_score]
-
-def determine_category(disease_name: str, symptoms: List[str]) -> str:
-    """
-    Determine disease category based on name and symptoms
-    """
-    text = (disease_name + ' ' + ' '.join(symptoms)).lower()
-    
-    category_keywords = {
-        'Digestive': ['stomach', 'digestion', 'appetite', 'nausea', 'vomiting', 'diarrhea', 'constipation'],
-        'Respiratory': ['cough', 'breathing', 'asthma', 'bronchitis', 'cold', 'sinus'],
-        'Skin': ['skin', 'rash', 'itching', 'eczema', 'psoriasis', 'acne'],
-        'Mental Health': ['anxiety', 'depression', 'stress', 'insomnia', 'mood'],
-        'Cardiovascular': ['heart', 'blood pressure', 'chest pain', 'palpitation'],
-        'Joints': ['joint', 'arthritis', 'pain', 'stiffness', 'swelling'],
-        'Neurological': ['headache', 'migraine', 'numbness', 'paralysis', 'seizure'],
-        'Endocrine': ['diabetes', 'thyroid', 'hormone', 'sugar'],
-        'Urogenital': ['urine', 'kidney', 'bladder', 'prostate', 'menstrual'],
-        'Eye': ['eye', 'vision', 'blindness', 'cataract'],
-        'Ear': ['ear', 'hearing', 'tinnitus', 'deafness'],
-        'Dental': ['tooth', 'dental', 'gum', 'mouth']
-    }
-    
-    for category, keywords in category_keywords.items():
-        if any(keyword in text for keyword in keywords):
-            return category
-    
-    return 'General'
-
 if __name__ == "__main__":
-    diseases = extract_diseases_from_lad_pdf()
-    print(f"\nExtraction complete! Found {len(diseases)} diseases.")
+    count, sample = extract_diseases_from_lad_pdf()
+    print(f"\nExtraction complete! Found {count} diseases.")
     print("\nSample diseases extracted:")
-    for i, disease in enumerate(diseases[:5]):
+    for i, disease in enumerate(sample):
         print(f"{i+1}. {disease['name']} - {disease['category']} - {', '.join(disease['dosha'])}") 
\ No newline at end of file
@@ -1,12 +1,18 @@
-import pdfplumber
 import re
-import json
 import os
-from typing import List, Dict, Any
+from typing import Iterator, Dict, Any
+
+from data_files import atomic_open, keep_first, write_json_array
+from instrumentation import get_profiler
+from lad_classifier import KeywordClassifier
+from lad_sections import iter_heading_sections, iter_lines
+from pdf_extraction import iter_pages
 
 PDF_PATH = "The_Complete_Book_of_Ayurvedic_Home_Remedies.pdf"
 OUTPUT_JSON = os.path.join(os.path.dirname(__file__), '../backend/data/diseases_lad_refined.json')
 
+PROFILE = get_profiler('extract_lad_diseases_refined')
+
 # Common disease names from Ayurvedic texts
 COMMON_DISEASES = [
     'Allergies', 'Anemia', 'Arthritis', 'Asthma', 'Bronchitis', 'Cancer', 'Cataracts',
@@ -29,70 +35,119 @@ SKIP_KEYWORDS = [
     'FREQUENCY', 'DURATION', 'SCHEDULE', 'ROUTINE', 'PRACTICE', 'REGIMEN'
 ]
 
-def extract_diseases_from_lad_pdf():
+# Disease-like suffixes and words, matched on the lowercased heading
+DISEASE_PATTERNS = [
+    r'\b(itis|osis|emia|algia|rrhagia|rrhea|plegia|trophy|pathy|oma|cele)\b',
+    r'\b(pain|disease|disorder|syndrome|infection|inflammation)\b'
+]
+
+# Each vocabulary is compiled once into a single alternation, so a heading is
+# classified with one scan per vocabulary instead of one substring test per entry
+_SKIP_RE = re.compile('|'.join(re.escape(keyword) for keyword in SKIP_KEYWORDS))
+_DISEASE_RE = re.compile('|'.join(
+    [re.escape(disease.lower()) for disease in COMMON_DISEASES] + DISEASE_PATTERNS
+))
+# Headings that are a fragment of a known name ("name in disease"); NUL never
+# occurs in a heading, so a match cannot span two names
+_COMMON_DISEASES_JOINED = '\0'.join(disease.lower() for disease in COMMON_DISEASES)
+
+DOSHA_KEYWORDS = {
+    'Vata': ['dry', 'cold', 'light', 'mobile', 'rough', 'constipation', 'anxiety', 'insomnia', 'pain', 'trembling'],
+    'Pitta': ['hot', 'burning', 'sharp', 'acidic', 'inflammation', 'fever', 'anger', 'irritation', 'redness'],
+    'Kapha': ['heavy', 'cold', 'oily', 'sweet', 'sticky', 'congestion', 'lethargy', 'weight gain', 'swelling']
+}
+
+CATEGORY_KEYWORDS = {
+    'Digestive': ['stomach', 'digestion', 'appetite', 'nausea', 'vomiting', 'diarrhea', 'constipation', 'ulcer', 'gastritis'],
+    'Respiratory': ['cough', 'breathing', 'asthma', 'bronchitis', 'cold', 'sinus', 'pneumonia'],
+    'Skin': ['skin', 'rash', 'itching', 'eczema', 'psoriasis', 'acne', 'warts'],
+    'Mental Health': ['anxiety', 'depression', 'stress', 'insomnia', 'mood'],
+    'Cardiovascular': ['heart', 'blood pressure', 'chest pain', 'palpitation', 'hypertension'],
+    'Joints': ['joint', 'arthritis', 'pain', 'stiffness', 'swelling', 'gout', 'rheumatism'],
+    'Neurological': ['headache', 'migraine', 'numbness', 'paralysis', 'seizure', 'epilepsy'],
+    'Endocrine': ['diabetes', 'thyroid', 'hormone', 'sugar'],
+    'Urogenital': ['urine', 'kidney', 'bladder', 'prostate', 'menstrual'],
+    'Eye': ['eye', 'vision', 'blindness', 'cataract'],
+    'Ear': ['ear', 'hearing', 'tinnitus', 'deafness'],
+    'Dental': ['tooth', 'dental', 'gum', 'mouth']
+}
+
+SEVERITY_KEYWORDS = {
+    'Severe': ['severe', 'acute', 'chronic', 'cancer', 'tumor', 'paralysis', 'coma', 'death'],
+    'Moderate': ['moderate', 'mild', 'manageable', 'treatable']
+}
+
+# Scores dosha, category and severity together, see lad_classifier.py
+CLASSIFIER = KeywordClassifier(DOSHA_KEYWORDS, CATEGORY_KEYWORDS, SEVERITY_KEYWORDS)
+
+def iter_lad_diseases(lines) -> Iterator[Dict[str, Any]]:
     """
-    Extract actual diseases from Dr. Vasant Lad's book
+    Yield each actual disease as soon as the next accepted heading closes its section
     """
-    print("Extracting diseases from Dr. Lad's PDF...")
-    
-    diseases = []
     disease_id_counter = 1
     
-    with pdfplumber.open(PDF_PATH) as pdf:
-        # Extract text from the encyclopedia section
-        text = ""
-        for i in range(120, len(pdf.pages)):
-            page_text = pdf.pages[i].extract_text()
-            if page_text:
-                text += page_text + "\n"
-    
     # Find disease sections more precisely
     # Look for patterns like "DISEASE NAME\nSymptoms:" or "DISEASE NAME\nCauses:"
-    disease_sections = re.split(r'\n([A-Z][A-Z\s\-\(\)\/]+)\n(?:Symptoms?|Causes?|Treatment|Remedy|Diet|Lifestyle)', text)
+    sections = PROFILE.iterate('segmentation', iter_heading_sections(
+        lines, r"A-Z\s\-\(\)\/", follow=r"(?:Symptoms?|Causes?|Treatment|Remedy|Diet|Lifestyle)"))
     
     current_disease = None
-    current_content = ""
+    current_content = []
     
-    for i, section in enumerate(disease_sections):
-        if i % 2 == 0:  # Content
-            if current_disease:
-                current_content += section
-        else:  # Potential disease name
-            disease_name = section.strip()
-            
-            # Skip if it's clearly not a disease
-            if any(keyword in disease_name.upper() for keyword in SKIP_KEYWORDS):
-                continue
+    for section_heading, section in sections:
+        if section_heading is not None:  # Potential disease name
+            disease_name = section_heading.strip()
             
-            # Check if it looks like a real disease
-            if not is_likely_disease(disease_name):
-                continue
+            # Skip if it's clearly not a disease, or doesn't look like a real one
+            if is_disease_heading(disease_name):
+                # If we have a previous disease, emit it
+                if current_disease and ''.join(current_content).strip():
+                    disease_data = parse_disease_content(current_disease, ''.join(current_content), disease_id_counter)
+                    if disease_data and disease_data['symptoms']:  # Only keep if we have symptoms
+                        yield disease_data
+                        disease_id_counter += 1
                 
-            # If we have a previous disease, save it
-            if current_disease and current_content.strip():
-                disease_data = parse_disease_content(current_disease, current_content, disease_id_counter)
-                if disease_data and disease_data['symptoms']:  # Only save if we have symptoms
-                    diseases.append(disease_data)
-                    disease_id_counter += 1
-            
-            # Start new disease
-            current_disease = disease_name
-            current_content = ""
+                # Start new disease
+                current_disease = disease_name
+                current_content = []
+        
+        # Content (skipped headings fold their content into the current disease)
+        if current_disease:
+            current_content.append(section)
     
     # Don't forget the last disease
-    if current_disease and current_content.strip():
-        disease_data = parse_disease_content(current_disease, current_content, disease_id_counter)
+    if current_disease and ''.join(current_content).strip():
+        disease_data = parse_disease_content(current_disease, ''.join(current_content), disease_id_counter)
         if disease_data and disease_data['symptoms']:
-            diseases.append(disease_data)
+            yield disease_data
+
+def extract_diseases_from_lad_pdf(sample_size: int = 10):
+    """
+    Extract actual diseases from Dr. Vasant Lad's book
+    """
+    print("Extracting diseases from Dr. Lad's PDF...")
     
-    print(f"Extracted {len(diseases)} actual diseases from Dr. Lad's book")
+    # Stream the encyclopedia section page by page
+    lines = iter_lines(PROFILE.iterate('pdf_extraction', iter_pages(PDF_PATH, start_page=120)))
+    diseases = PROFILE.iterate('iter_lad_diseases', iter_lad_diseases(lines))
     
     # Save to JSON
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(diseases, f, indent=2, ensure_ascii=False)
+    sample = []
+    with PROFILE.span('json_write') as stats, atomic_open(OUTPUT_JSON) as f:
+        count = write_json_array(f, keep_first(diseases, sample, sample_size), ensure_ascii=False)
+        stats.records_in += count
     
+    print(f"Extracted {count} actual diseases from Dr. Lad's book")
     print(f"Saved to {OUTPUT_JSON}")
-    return diseases
+    PROFILE.write_report()
+    return count, sample
+
+def is_disease_heading(name: str) -> bool:
+    """
+    Check if a stripped heading starts a disease section: not a skip keyword
+    heading, and likely to be a disease
+    """
+    return not _SKIP_RE.search(name.upper()) and is_likely_disease(name)
 
 def is_likely_disease(name: str) -> bool:
     """
@@ -100,20 +155,9 @@ def is_likely_disease(name: str) -> bool:
     """
     name_lower = name.lower()
     
-    # Check against common disease names
-    for disease in COMMON_DISEASES:
-        if disease.lower() in name_lower or name_lower in disease.lower():
-            return True
-    
-    # Check for disease-like patterns
-    disease_patterns = [
-        r'\b(itis|osis|emia|algia|rrhagia|rrhea|plegia|trophy|pathy|oma|cele)\b',
-        r'\b(pain|disease|disorder|syndrome|infection|inflammation)\b'
-    ]
-    
-    for pattern in disease_patterns:
-        if re.search(pattern, name_lower):
-            return True
+    # Check against common disease names and disease-like patterns
+    if _DISEASE_RE.search(name_lower) or name_lower in _COMMON_DISEASES_JOINED:
+        return True
     
     # Check if it's a short, capitalized name (likely a disease)
     if len(name.split()) <= 3 and name.isupper():
@@ -121,6 +165,7 @@ def is_likely_disease(name: str) -> bool:
     
     return False
 
+@PROFILE.timed('parse_disease_content')
 def parse_disease_content(disease_name: str, content: str, disease_id: int) -> Dict[str, Any]:
     """
     Parse disease content and extract structured information
@@ -180,14 +225,10 @@ def parse_disease_content(disease_name: str, content: str, disease_id: int) -> D
         lifestyle_text = lifestyle_matches[0].strip()
         lifestyle = [l.strip() for l in re.split(r'[;,\n]', lifestyle_text) if l.strip() and len(l.strip()) > 3]
     
-    # Determine dosha
-    dosha = determine_dosha(symptoms, causes, content)
-    
-    # Determine category
-    category = determine_category(disease_name, symptoms)
-    
-    # Determine severity
-    severity = determine_severity(symptoms, causes, content)
+    # Determine dosha, category and severity in one pass
+    with PROFILE.span('classification', records_in=1):
+        labels = CLASSIFIER.classify(disease_name, symptoms, causes, content)
+    dosha, category, severity = labels['dosha'], labels['category'], labels['severity']
     
     # Create disease object
     disease_data = {
@@ -214,67 +255,6 @@ def parse_disease_content(disease_name: str, content: str, disease_id: int) -> D
     
     return disease_data
 
-def determine_dosha(symptoms: List[str], causes: List[str], content: str) -> List[str]:
-    """Determine dosha based on symptoms, causes, and content"""
-    dosha_keywords = {
-        'Vata': ['dry', 'cold', 'light', 'mobile', 'rough', 'constipation', 'anxiety', 'insomnia', 'pain', 'trembling'],
-        'Pitta': ['hot', 'burning', 'sharp', 'acidic', 'inflammation', 'fever', 'anger', 'irritation', 'redness'],
-        'Kapha': ['heavy', 'cold', 'oily', 'sweet', 'sticky', 'congestion', 'lethargy', 'weight gain', 'swelling']
-    }
-    
-    text = ' '.join(symptoms + causes + [content]).lower()
-    dosha_scores = {'Vata': 0, 'Pitta': 0, 'Kapha': 0}
-    
-    for dosha, keywords in dosha_keywords.items():
-        for keyword in keywords:
-            if keyword in text:
-                dosha_scores[dosha] += 1
-    
-    max_score = max(dosha_scores.values())
-    if max_score == 0:
-        return ['Vata']
-    
-    return [dosha for dosha, score in dosha_scores.items() if score == max_score]
-
-def determine_category(disease_name: str, symptoms: List[str]) -> str:
-    """Determine disease category"""
-    text = (disease_name + ' ' + ' '.join(symptoms)).lower()
-    
-    category_keywords = {
-        'Digestive': ['stomach', 'digestion', 'appetite', 'nausea', 'vomiting', 'diarrhea', 'constipation', 'ulcer', 'gastritis'],
-        'Respiratory': ['cough', 'breathing', 'asthma', 'bronchitis', 'cold', 'sinus', 'pneumonia'],
-        'Skin': ['skin', 'rash', 'itching', 'eczema', 'psoriasis', 'acne', 'warts'],
-        'Mental Health': ['anxiety', 'depression', 'stress', 'insomnia', 'mood'],
-        'Cardiovascular': ['heart', 'blood pressure', 'chest pain', 'palpitation', 'hypertension'],
-        'Joints': ['joint', 'arthritis', 'pain', 'stiffness', 'swelling', 'gout', 'rheumatism'],
-        'Neurological': ['headache', 'migraine', 'numbness', 'paralysis', 'seizure', 'epilepsy'],
-        'Endocrine': ['diabetes', 'thyroid', 'hormone', 'sugar'],
-        'Urogenital': ['urine', 'kidney', 'bladder', 'prostate', 'menstrual'],
-        'Eye': ['eye', 'vision', 'blindness', 'cataract'],
-        'Ear': ['ear', 'hearing', 'tinnitus', 'deafness'],
-        'Dental': ['tooth', 'dental', 'gum', 'mouth']
-    }
-    
-    for category, keywords in category_keywords.items():
-        if any(keyword in text for keyword in keywords):
-            return category
-    
-    return 'General'
-
-def determine_severity(symptoms: List[str], causes: List[str], content: str) -> str:
-    """Determine disease severity"""
-    text = ' '.join(symptoms + causes + [content]).lower()
-    
-    severe_keywords = ['severe', 'acute', 'chronic', 'cancer', 'tumor', 'paralysis', 'coma', 'death']
-    moderate_keywords = ['moderate', 'mild', 'manageable', 'treatable']
-    
-    if any(keyword in text for keyword in severe_keywords):
-        return 'Severe'
-    elif any(keyword in text for keyword in moderate_keywords):
-        return 'Moderate'
-    else:
-        return 'Mild to Moderate'
-
 def get_modern_correlation(disease_name: str) -> str:
     """Get modern medical correlation for disease"""
     correlations = {
@@ -331,8 +311,8 @@ def get_modern_correlation(disease_name: str) -> str:
     return correlations.get(disease_name, "")
 
 if __name__ == "__main__":
-    diseases = extract_diseases_from_lad_pdf()
-    print(f"\nExtraction complete! Found {len(diseases)} actual diseases.")
+    count, sample = extract_diseases_from_lad_pdf()
+    print(f"\nExtraction complete! Found {count} actual diseases.")
     print("\nSample diseases extracted:")
-    for i, disease in enumerate(diseases[:10]):
+    for i, disease in enumerate(sample):
         print(f"{i+1}. {disease['name']} - {disease['category']} - {', '.join(disease['dosha'])} - {len(disease['symptoms'])} symptoms") 
\ No newline at end of file
@@ -1,11 +1,17 @@
-import pdfplumber
 import re
-import json
 import os
 
+from data_files import atomic_open, keep_first, write_json_array
+from instrumentation import get_profiler
+from lad_classifier import KeywordClassifier
+from lad_sections import iter_blocks, iter_lines
+from pdf_extraction import iter_pages
+
 PDF_PATH = "The_Complete_Book_of_Ayurvedic_Home_Remedies.pdf"
 OUTPUT_JSON = os.path.join(os.path.dirname(__file__), '../backend/data/diseases_lad_simple.json')
 
+PROFILE = get_profiler('extract_lad_diseases_simple')
+
 # Known diseases from Dr. Lad's book
 KNOWN_DISEASES = [
     'Allergies', 'Anemia', 'Arthritis', 'Asthma', 'Back Pain', 'Bronchitis', 'Cancer',
@@ -19,27 +25,38 @@ KNOWN_DISEASES = [
     'Vitiligo', 'Vomiting', 'Warts', 'Worms'
 ]
 
-def extract_diseases_from_lad_pdf():
+DOSHA_KEYWORDS = {
+    'Vata': ['dry', 'cold', 'light', 'mobile', 'rough', 'constipation', 'anxiety', 'insomnia', 'pain'],
+    'Pitta': ['hot', 'burning', 'sharp', 'acidic', 'inflammation', 'fever', 'anger', 'irritation'],
+    'Kapha': ['heavy', 'cold', 'oily', 'sweet', 'sticky', 'congestion', 'lethargy', 'weight gain']
+}
+
+CATEGORY_KEYWORDS = {
+    'Digestive': ['stomach', 'digestion', 'appetite', 'nausea', 'vomiting', 'diarrhea', 'constipation', 'ulcer', 'gastritis'],
+    'Respiratory': ['cough', 'breathing', 'asthma', 'bronchitis', 'cold', 'sinus', 'pneumonia'],
+    'Skin': ['skin', 'rash', 'itching', 'eczema', 'psoriasis', 'acne', 'warts'],
+    'Mental Health': ['anxiety', 'depression', 'stress', 'insomnia', 'mood'],
+    'Cardiovascular': ['heart', 'blood pressure', 'chest pain', 'palpitation', 'hypertension'],
+    'Joints': ['joint', 'arthritis', 'pain', 'stiffness', 'swelling', 'gout', 'rheumatism'],
+    'Neurological': ['headache', 'migraine', 'numbness', 'paralysis', 'seizure', 'epilepsy'],
+    'Endocrine': ['diabetes', 'thyroid', 'hormone', 'sugar'],
+    'Urogenital': ['urine', 'kidney', 'bladder', 'prostate', 'menstrual'],
+    'Eye': ['eye', 'vision', 'blindness', 'cataract'],
+    'Ear': ['ear', 'hearing', 'tinnitus', 'deafness'],
+    'Dental': ['tooth', 'dental', 'gum', 'mouth']
+}
+
+# Scores dosha and category together, see lad_classifier.py
+CLASSIFIER = KeywordClassifier(DOSHA_KEYWORDS, CATEGORY_KEYWORDS)
+
+def iter_lad_diseases(page_lines):
     """
-    Extract diseases from Dr. Lad's book using a simpler approach
+    Yield each known disease as soon as its blank-line separated block is complete
     """
-    print("Extracting diseases from Dr. Lad's PDF...")
-    
-    diseases = []
     disease_id_counter = 1
     
-    with pdfplumber.open(PDF_PATH) as pdf:
-        # Extract text from the encyclopedia section
-        text = ""
-        for i in range(120, len(pdf.pages)):
-            page_text = pdf.pages[i].extract_text()
-            if page_text:
-                text += page_text + "\n"
-    
     # Split text into sections
-    sections = text.split('\n\n')
-    
-    for section in sections:
+    for section in PROFILE.iterate('segmentation', iter_blocks(page_lines)):
         lines = section.strip().split('\n')
         if len(lines) < 2:
             continue
@@ -65,18 +82,31 @@ def extract_diseases_from_lad_pdf():
         disease_data = parse_disease_section(disease_name, disease_content, disease_id_counter)
         
         if disease_data and disease_data['symptoms']:
-            diseases.append(disease_data)
+            yield disease_data
             disease_id_counter += 1
+
+def extract_diseases_from_lad_pdf(sample_size: int = 10):
+    """
+    Extract diseases from Dr. Lad's book using a simpler approach
+    """
+    print("Extracting diseases from Dr. Lad's PDF...")
     
-    print(f"Extracted {len(diseases)} diseases from Dr. Lad's book")
+    # Stream the encyclopedia section page by page
+    pages = PROFILE.iterate('pdf_extraction', iter_pages(PDF_PATH, start_page=120))
+    diseases = PROFILE.iterate('iter_lad_diseases', iter_lad_diseases(iter_lines(pages)))
     
     # Save to JSON
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(diseases, f, indent=2, ensure_ascii=False)
+    sample = []
+    with PROFILE.span('json_write') as stats, atomic_open(OUTPUT_JSON) as f:
+        count = write_json_array(f, keep_first(diseases, sample, sample_size), ensure_ascii=False)
+        stats.records_in += count
     
+    print(f"Extracted {count} diseases from Dr. Lad's book")
     print(f"Saved to {OUTPUT_JSON}")
-    return diseases
+    PROFILE.write_report()
+    return count, sample
 
+@PROFILE.timed('parse_disease_section')
 def parse_disease_section(disease_name: str, content: str, disease_id: int):
     """
     Parse a disease section and extract information
@@ -133,11 +163,10 @@ def parse_disease_section(disease_name: str, content: str, disease_id: int):
         lifestyle_text = lifestyle_match.group(1).strip()
         lifestyle = [l.strip() for l in re.split(r'[;,\n]', lifestyle_text) if l.strip() and len(l.strip()) > 3]
     
-    # Determine dosha
-    dosha = determine_dosha(symptoms, causes, content)
-    
-    # Determine category
-    category = determine_category(disease_name, symptoms)
+    # Determine dosha and category in one pass
+    with PROFILE.span('classification', records_in=1):
+        labels = CLASSIFIER.classify(disease_name, symptoms, causes, content)
+    dosha, category = labels['dosha'], labels['category']
     
     # Create disease object
     disease_data = {
@@ -164,54 +193,6 @@ def parse_disease_section(disease_name: str, content: str, disease_id: int):
     
     return disease_data
 
-def determine_dosha(symptoms, causes, content):
-    """Determine dosha based on content"""
-    text = ' '.join(symptoms + causes + [content]).lower()
-    
-    dosha_keywords = {
-        'Vata': ['dry', 'cold', 'light', 'mobile', 'rough', 'constipation', 'anxiety', 'insomnia', 'pain'],
-        'Pitta': ['hot', 'burning', 'sharp', 'acidic', 'inflammation', 'fever', 'anger', 'irritation'],
-        'Kapha': ['heavy', 'cold', 'oily', 'sweet', 'sticky', 'congestion', 'lethargy', 'weight gain']
-    }
-    
-    dosha_scores = {'Vata': 0, 'Pitta': 0, 'Kapha': 0}
-    
-    for dosha, keywords in dosha_keywords.items():
-        for keyword in keywords:
-            if keyword in text:
-                dosha_scores[dosha] += 1
-    
-    max_score = max(dosha_scores.values())
-    if max_score == 0:
-        return ['Vata']
-    
-    return [dosha for dosha, score in dosha_scores.items() if score == max_score]
-
-def determine_category(disease_name, symptoms):
-    """Determine disease category"""
-    text = (disease_name + ' ' + ' '.join(symptoms)).lower()
-    
-    category_keywords = {
-        'Digestive': ['stomach', 'digestion', 'appetite', 'nausea', 'vomiting', 'diarrhea', 'constipation', 'ulcer', 'gastritis'],
-        'Respiratory': ['cough', 'breathing', 'asthma', 'bronchitis', 'cold', 'sinus', 'pneumonia'],
-        'Skin': ['skin', 'rash', 'itching', 'eczema', 'psoriasis', 'acne', 'warts'],
-        'Mental Health': ['anxiety', 'depression', 'stress', 'insomnia', 'mood'],
-        'Cardiovascular': ['heart', 'blood pressure', 'chest pain', 'palpitation', 'hypertension'],
-        'Joints': ['joint', 'arthritis', 'pain', 'stiffness', 'swelling', 'gout', 'rheumatism'],
-        'Neurological': ['headache', 'migraine', 'numbness', 'paralysis', 'seizure', 'epilepsy'],
-        'Endocrine': ['diabetes', 'thyroid', 'hormone', 'sugar'],
-        'Urogenital': ['urine', 'kidney', 'bladder', 'prostate', 'menstrual'],
-        'Eye': ['eye', 'vision', 'blindness', 'cataract'],
-        'Ear': ['ear', 'hearing', 'tinnitus', 'deafness'],
-        'Dental': ['tooth', 'dental', 'gum', 'mouth']
-    }
-    
-    for category, keywords in category_keywords.items():
-        if any(keyword in text for keyword in keywords):
-            return category
-    
-    return 'General'
-
 def get_modern_correlation(disease_name):
     """Get modern medical correlation"""
     correlations = {
@@ -271,8 +252,8 @@ def get_modern_correlation(disease_name):
     return correlations.get(disease_name, "")
 
 if __name__ == "__main__":
-    diseases = extract_diseases_from_lad_pdf()
-    print(f"\nExtraction complete! Found {len(diseases)} diseases.")
+    count, sample = extract_diseases_from_lad_pdf()
+    print(f"\nExtraction complete! Found {count} diseases.")
     print("\nSample diseases extracted:")
-    for i, disease in enumerate(diseases[:10]):
+    for i, disease in enumerate(sample):
         print(f"{i+1}. {disease['name']} - {disease['category']} - {', '.join(disease['dosha'])} - {len(disease['symptoms'])} symptoms") 
\ No newline at end of file
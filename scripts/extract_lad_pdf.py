@@ -1,13 +1,19 @@
-import pdfplumber
 import re
-import json
 import requests
 import os
+from itertools import chain
+
+from data_files import atomic_open, write_json_array
+from instrumentation import get_profiler
+from lad_sections import StartAt, iter_heading_sections, iter_lines
+from pdf_extraction import iter_pages
 
 PDF_URL = "https://ia802808.us.archive.org/21/items/TheCompleteBookOfAyurvedicHomeRemedies/The%20Complete%20Book%20of%20Ayurvedic%20Home%20Remedies.pdf"
 PDF_PATH = "The_Complete_Book_of_Ayurvedic_Home_Remedies.pdf"
 OUTPUT_JSON = os.path.join(os.path.dirname(__file__), '../backend/data/diseases_lad.json')
 
+PROFILE = get_profiler('extract_lad_pdf')
+
 # Download the PDF if not present
 def download_pdf():
     if not os.path.exists(PDF_PATH):
@@ -19,36 +25,21 @@ def download_pdf():
     else:
         print("PDF already exists.")
 
-def extract_diseases():
-    print("Extracting diseases from PDF...")
-    diseases = []
-    with pdfplumber.open(PDF_PATH) as pdf:
-        # Start from page 120 (0-indexed)
-        text = ""
-        for i in range(120, len(pdf.pages)):
-            page_text = pdf.pages[i].extract_text()
-            if page_text:
-                text += page_text + "\n"
-
-    # Find the start of the encyclopedia section (first disease: Allergies)
-    start = text.find("Allergies")
-    if start == -1:
-        print("Could not find 'Allergies' heading in PDF.")
-        return
-    encyclopedia = text[start:]
-
+def iter_diseases(lines):
+    """Yield each disease record as soon as the next heading closes its section"""
     # Split by disease headings (capitalized, possibly with spaces, e.g., 'Allergies', 'Anemia', etc.)
-    entries = re.split(r"\n([A-Z][a-zA-Z\s\-\(\)\/]+)\n", encyclopedia)
-    for i in range(1, len(entries), 2):
-        name = entries[i].strip()
-        content = entries[i+1].strip()
+    for name, content in PROFILE.iterate('segmentation', iter_heading_sections(lines, r"a-zA-Z\s\-\(\)\/")):
+        if name is None:
+            continue
+        name = name.strip()
+        content = content.strip()
         # Extract symptoms, causes, treatments, diet, lifestyle heuristically
         symptoms = re.findall(r"Symptoms?:\s*(.*?)(?:\n|$)", content, re.IGNORECASE)
         causes = re.findall(r"Causes?:\s*(.*?)(?:\n|$)", content, re.IGNORECASE)
         treatments = re.findall(r"(?:Remedy|Treatment|Home Remedy|Ayurvedic Remedy):?(.*?)(?:\n[A-Z][a-z]+:|$)", content, re.IGNORECASE | re.DOTALL)
         diet = re.findall(r"Diet:?(.*?)(?:\n[A-Z][a-z]+:|$)", content, re.IGNORECASE | re.DOTALL)
         lifestyle = re.findall(r"Lifestyle:?(.*?)(?:\n[A-Z][a-z]+:|$)", content, re.IGNORECASE | re.DOTALL)
-        disease = {
+        yield {
             "name": name,
             "symptoms": [s.strip() for s in symptoms[0].split(';')] if symptoms else [],
             "causes": [c.strip() for c in causes[0].split(';')] if causes else [],
@@ -58,11 +49,29 @@ def extract_diseases():
             "lifestyle": [l.strip() for l in lifestyle[0].split(';')] if lifestyle else [],
             "source": "The Complete Book of Ayurvedic Home Remedies"
         }
-        diseases.append(disease)
-    print(f"Extracted {len(diseases)} diseases.")
-    with open(OUTPUT_JSON, "w") as f:
-        json.dump(diseases, f, indent=2)
+
+def extract_diseases():
+    print("Extracting diseases from PDF...")
+    # Start from page 120 (0-indexed)
+    lines = iter_lines(PROFILE.iterate('pdf_extraction', iter_pages(PDF_PATH, start_page=120)))
+
+    # Find the start of the encyclopedia section (first disease: Allergies)
+    encyclopedia = StartAt(lines, "Allergies")
+    diseases = PROFILE.iterate('iter_diseases', iter_diseases(encyclopedia))
+    # Pulling the first record scans up to the heading, so a missing heading
+    # is known before the existing output is touched
+    first = next(diseases, None)
+    if not encyclopedia.found:
+        print("Could not find 'Allergies' heading in PDF.")
+        return
+    if first is not None:
+        diseases = chain([first], diseases)
+    with PROFILE.span('json_write') as stats, atomic_open(OUTPUT_JSON) as f:
+        count = write_json_array(f, diseases)
+        stats.records_in += count
+    print(f"Extracted {count} diseases.")
     print(f"Saved to {OUTPUT_JSON}")
+    PROFILE.write_report()
 
 if __name__ == "__main__":
     download_pdf()
@@ -8,32 +8,29 @@ import json
 import os
 import re
 from pathlib import Path
-import PyPDF2
-import fitz  # PyMuPDF
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 
+from pdf_extraction import extract_text
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class YogaDataExtractor:
-    def __init__(self, pdf_path: str, output_path: str):
+    def __init__(self, pdf_path: str, output_path: str, workers: Optional[int] = None):
         self.pdf_path = pdf_path
         self.output_path = output_path
+        self.workers = workers
         self.yoga_poses = []
         self.sequences = []
         
     def extract_text_from_pdf(self) -> str:
         """Extract text from PDF using PyMuPDF for better accuracy"""
         try:
-            doc = fitz.open(self.pdf_path)
-            text = ""
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                text += page.get_text()
-            doc.close()
-            return text
+            return extract_text(self.pdf_path, backend='pymupdf', workers=self.workers)
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             return ""
@@ -603,8 +600,8 @@ class YogaDataExtractor:
         logger.info("Yoga data extraction completed successfully!")
 
 def main():
-    pdf_path = "/Users/god/Downloads/Mero pahichan/public/David-Frawley-Sandra-Summerfield-Kozak-Yoga-For-Your-Type-An-Ayurvedic-Approach-To-Your-Asana-Practice-autoocr.pdf"
-    output_path = "/Users/god/Downloads/Mero pahichan/src/assets/comprehensive_yoga_data.json"
+    pdf_path = os.path.join(REPO_ROOT, 'public', 'David-Frawley-Sandra-Summerfield-Kozak-Yoga-For-Your-Type-An-Ayurvedic-Approach-To-Your-Asana-Practice-autoocr.pdf')
+    output_path = os.path.join(REPO_ROOT, 'src', 'assets', 'comprehensive_yoga_data.json')
     
     extractor = YogaDataExtractor(pdf_path, output_path)
     extractor.run()
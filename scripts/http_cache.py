@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP response cache settings for the Ayurveda spider.
+
+Crawls go through Scrapy's HttpCacheMiddleware with the RFC 2616 policy:
+cached responses are reused while fresh and revalidated with If-None-Match /
+If-Modified-Since (from the stored ETag / Last-Modified) once stale, so a
+re-crawl only downloads resources that changed. Response bodies are stored
+content-addressed, so the same PDF mirrored under several URLs is kept on
+disk once.
+
+Set AYUR_HTTP_OFFLINE=1 to replay a crawl from the cache directory
+(AYUR_HTTP_CACHE_DIR, e.g. a fixture directory) without touching the
+network; requests with no cached response are dropped.
+"""
+
+import hashlib
+import os
+
+from scrapy.extensions.httpcache import FilesystemCacheStorage
+
+from ayur_config import CACHE_DIR
+
+HTTP_CACHE_DIR = os.environ.get('AYUR_HTTP_CACHE_DIR', os.path.join(CACHE_DIR, 'http'))
+
+
+class ContentAddressedCacheStorage(FilesystemCacheStorage):
+    """
+    FilesystemCacheStorage whose response bodies are hard links into a
+    blobs/<sha256> store, so identical bodies share one file on disk.
+    """
+
+    def store_response(self, spider, request, response):
+        body_path = os.path.join(self._get_request_path(spider, request), 'response_body')
+        # The parent rewrites response_body in place; unlink it first so a
+        # changed body never truncates the blob it is hard-linked to
+        try:
+            os.remove(body_path)
+        except FileNotFoundError:
+            pass
+        super().store_response(spider, request, response)
+        digest = hashlib.sha256(response.body).hexdigest()
+        blob_dir = os.path.join(self.cachedir, 'blobs', digest[:2])
+        blob_path = os.path.join(blob_dir, digest)
+        os.makedirs(blob_dir, exist_ok=True)
+        try:
+            if os.path.exists(blob_path):
+                os.remove(body_path)
+            else:
+                os.replace(body_path, blob_path)
+            os.link(blob_path, body_path)
+        except OSError:
+            # No hard links here (or a race with another writer): keep a plain copy
+            if not os.path.exists(body_path):
+                with open(body_path, 'wb') as f:
+                    f.write(response.body)
+
+
+def http_cache_settings(offline=None):
+    """Scrapy settings enabling the persistent response cache"""
+    if offline is None:
+        offline = os.environ.get('AYUR_HTTP_OFFLINE', '') not in ('', '0')
+    settings = {
+        'HTTPCACHE_ENABLED': True,
+        'HTTPCACHE_DIR': os.path.abspath(HTTP_CACHE_DIR),
+        'HTTPCACHE_EXPIRATION_SECS': 0,
+        'HTTPCACHE_STORAGE': 'http_cache.ContentAddressedCacheStorage',
+    }
+    if offline:
+        # Serve everything from the cache and never hit the network
+        settings.update({
+            'HTTPCACHE_POLICY': 'scrapy.extensions.httpcache.DummyPolicy',
+            'HTTPCACHE_IGNORE_MISSING': True,
+        })
+    else:
+        settings.update({
+            'HTTPCACHE_POLICY': 'scrapy.extensions.httpcache.RFC2616Policy',
+            # Store responses without cache headers too, so they can be revalidated
+            'HTTPCACHE_ALWAYS_STORE': True,
+        })
+    return settings
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Compiled herb / toxic ingredient matcher for the Ayurveda spider.
+
+The spider used to rebuild and re-run a '|'.join(...) regex for every
+treatment sentence and then check each hit against the keyword lists. An
+IngredientMatcher compiles the alternation once and maps every hit, whatever
+its casing in the source text, to its canonical name through set-backed
+lookups, returning herbs and toxic hits from the same scan.
+"""
+
+import re
+from typing import Iterable, List, NamedTuple
+
+
+class IngredientHits(NamedTuple):
+    ingredients: List[str]  # every hit, canonical name, in text order
+    herbs: List[str]
+    toxic: List[str]
+
+
+class IngredientMatcher:
+    def __init__(self, herbs: Iterable[str], toxic: Iterable[str]):
+        herbs, toxic = list(herbs), list(toxic)
+        self.canonical = {name.lower(): name for name in herbs + toxic}
+        self.herbs = {name.lower() for name in herbs}
+        self.toxic = {name.lower() for name in toxic}
+        # Longest names first, so a name is never cut short by one of its prefixes
+        names = sorted(self.canonical, key=len, reverse=True)
+        self.pattern = re.compile(r'\b(' + '|'.join(re.escape(name) for name in names) + r')\b', re.I)
+
+    def match(self, text: str) -> IngredientHits:
+        ingredients, herbs, toxic = [], [], []
+        for hit in self.pattern.findall(text):
+            key = hit.lower()
+            name = self.canonical[key]
+            ingredients.append(name)
+            if key in self.herbs:
+                herbs.append(name)
+            if key in self.toxic:
+                toxic.append(name)
+        return IngredientHits(ingredients, herbs, toxic)
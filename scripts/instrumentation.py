@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-stage timing and memory instrumentation for the extraction scripts.
+
+Stages are recorded as spans: a `with profiler.span('json_write')` block, a
+function decorated with @profiler.timed('parse_disease_content'), or a
+generator wrapped with profiler.iterate('pdf_extraction', pages), which
+times each next() call and counts the items it produces. Spans with the
+same name are aggregated. Time spent in a nested span is subtracted from
+its parent's self time, so pulling pages through a lazy pipeline is charged
+to the stage that produced them, not the one that asked.
+
+For each span the report has calls, wall and CPU time (total and self),
+records in and out, the process' peak RSS when the span last closed and,
+with AYUR_PROFILE_TRACEMALLOC=1, the tracemalloc peak (since the enclosing
+top-level span started; tracing slows the run down considerably).
+
+Set AYUR_PROFILE to a .json path, or to a directory to get one timestamped
+report per run there; without it every call is a no-op. Peak RSS and child
+CPU time come from the POSIX resource module and are reported as null where
+it is unavailable (Windows).
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from functools import wraps
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _children_cpu() -> Optional[float]:
+    """CPU time of exited child processes (e.g. PDF extraction workers)"""
+    if resource is None:
+        return None
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return children.ru_utime + children.ru_stime
+
+
+class SpanStats:
+    __slots__ = ('name', 'calls', 'wall', 'cpu', 'child_wall', 'child_cpu',
+                 'records_in', 'records_out', 'peak_rss_kb', 'traced_peak')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall = self.cpu = self.child_wall = self.child_cpu = 0.0
+        self.records_in = self.records_out = 0
+        self.peak_rss_kb = None
+        self.traced_peak = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'wall_s': round(self.wall, 6),
+            'cpu_s': round(self.cpu, 6),
+            'self_wall_s': round(self.wall - self.child_wall, 6),
+            'self_cpu_s': round(self.cpu - self.child_cpu, 6),
+            'records_in': self.records_in,
+            'records_out': self.records_out,
+            'peak_rss_kb': self.peak_rss_kb,
+            'traced_peak_bytes': self.traced_peak,
+        }
+
+
+class _Span:
+    __slots__ = ('profiler', 'stats', 'wall', 'cpu')
+
+    def __init__(self, profiler: 'Profiler', stats: SpanStats):
+        self.profiler = profiler
+        self.stats = stats
+
+    def __enter__(self) -> SpanStats:
+        stack = self.profiler.stack
+        if not stack and self.profiler.trace_memory:
+            tracemalloc.reset_peak()
+        stack.append(self.stats)
+        self.stats.calls += 1
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self.stats
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        stats = self.stats
+        stats.wall += wall
+        stats.cpu += cpu
+        peak = _peak_rss_kb()
+        if peak is not None:
+            stats.peak_rss_kb = max(stats.peak_rss_kb or 0, peak)
+        if self.profiler.trace_memory:
+            stats.traced_peak = max(stats.traced_peak or 0, tracemalloc.get_traced_memory()[1])
+        stack = self.profiler.stack
+        stack.pop()
+        if stack:
+            stack[-1].child_wall += wall
+            stack[-1].child_cpu += cpu
+        return False
+
+
+class _NullSpan:
+    """Shared stand-in when profiling is off; absorbs record counts"""
+    records_in = records_out = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    def __init__(self, name: str, report_path: Optional[str] = None, trace_memory: bool = False):
+        self.name = name
+        self.report_path = report_path
+        self.enabled = report_path is not None
+        self.trace_memory = self.enabled and trace_memory
+        self.spans: Dict[str, SpanStats] = {}
+        self.stack: List[SpanStats] = []
+        self.started = datetime.now()
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.children_cpu = _children_cpu() if self.enabled else None
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def span(self, name: str, records_in: int = 0):
+        """Context manager timing one stage; the yielded stats take records_in/records_out"""
+        if not self.enabled:
+            return _NULL_SPAN
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans[name] = SpanStats(name)
+        stats.records_in += records_in
+        return _Span(self, stats)
+
+    def timed(self, name: str):
+        """Decorator: one record in per call, one out per result that is not None"""
+        def decorate(fn):
+            if not self.enabled:
+                return fn
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name, records_in=1) as stats:
+                    result = fn(*args, **kwargs)
+                    if result is not None:
+                        stats.records_out += 1
+                    return result
+            return wrapper
+        return decorate
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterable:
+        """Time each item pulled from iterable as the named stage"""
+        if not self.enabled:
+            return iterable
+        return self._iterate(name, iterable)
+
+    def _iterate(self, name: str, iterable: Iterable) -> Iterator:
+        iterator = iter(iterable)
+        while True:
+            with self.span(name) as stats:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                stats.records_out += 1
+            yield item
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'script': self.name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'argv': sys.argv,
+            'wall_s': round(time.perf_counter() - self.wall, 6),
+            'cpu_s': round(time.process_time() - self.cpu, 6),
+            # Worker processes (e.g. PDF extraction shards) that have exited
+            'children_cpu_s': (None if self.children_cpu is None
+                               else round(_children_cpu() - self.children_cpu, 6)),
+            'peak_rss_kb': _peak_rss_kb(),
+            'tracemalloc': self.trace_memory,
+            'spans': [stats.as_dict() for stats in self.spans.values()],
+        }
+
+    def write_report(self) -> Optional[str]:
+        """Write the JSON report if profiling is on; returns its path"""
+        if not self.enabled:
+            return None
+        path = self.report_path
+        if not path.endswith('.json'):
+            path = os.path.join(path, f"{self.name}-{self.started:%Y%m%d-%H%M%S}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"Profile written to {path}")
+        return path
+
+
+_PROFILERS: Dict[str, Profiler] = {}
+
+
+def get_profiler(name: str) -> Profiler:
+    """The profiler for a script, enabled when AYUR_PROFILE is set"""
+    if name not in _PROFILERS:
+        _PROFILERS[name] = Profiler(
+            name,
+            report_path=os.environ.get('AYUR_PROFILE') or None,
+            trace_memory=os.environ.get('AYUR_PROFILE_TRACEMALLOC', '') not in ('', '0'),
+        )
+    return _PROFILERS[name]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for the JavaScript data modules in backend/data.
+
+The modules look like `const diseases = [ {...}, ... ]; module.exports = diseases;`
+with JS object literals rather than JSON: single-quoted and template strings
+(without interpolation), unquoted keys, trailing commas and comments. The file
+is tokenized in fixed-size chunks and the first top-level array is parsed one
+element at a time, so only the element being parsed is held in memory.
+"""
+
+import re
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+CHUNK_SIZE = 1 << 16
+# Characters past a token needed to be sure it is complete
+_LOOKAHEAD = 3
+
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|`(?:[^`\\]|\\.)*`)
+  | (?P<number>-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]:,;=().])
+''', re.S | re.X)
+
+_ESCAPE_RE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)', re.S)
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+                   '\n': '', '\r\n': '', '\r': ''}
+_CONSTANTS = {'true': True, 'false': False, 'null': None, 'undefined': None,
+              'NaN': float('nan'), 'Infinity': float('inf')}
+
+
+class JSSyntaxError(ValueError):
+    pass
+
+
+def _unescape(match) -> str:
+    escape = match.group(1)
+    if escape.startswith('u{'):
+        return chr(int(escape[2:-1], 16))
+    if escape[0] in 'ux' and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    return _SIMPLE_ESCAPES.get(escape, escape)
+
+
+def decode_string(token: str) -> str:
+    text = _ESCAPE_RE.sub(_unescape, token[1:-1])
+    # \uXXXX pairs come out as lone surrogates; recombine them
+    return text.encode('utf-16', 'surrogatepass').decode('utf-16')
+
+
+def iter_tokens(f: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, str]]:
+    """Yield (kind, text) tokens, skipping whitespace and comments"""
+    buf = f.read(chunk_size)
+    pos = 0
+    eof = not buf
+    while True:
+        if pos >= len(buf):
+            if eof:
+                return
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+            continue
+        match = _TOKEN_RE.match(buf, pos)
+        # A token ending near the end of the buffer may continue in the next
+        # chunk ('1.5' -> '1.5e3', '0' -> '0x1F'), so read more before deciding
+        if not eof and (match is None or len(buf) - match.end() < _LOOKAHEAD):
+            more = f.read(chunk_size)
+            if more:
+                buf, pos = buf[pos:] + more, 0
+                continue
+            eof = True
+            continue
+        if match is None:
+            raise JSSyntaxError(f"Unexpected character {buf[pos]!r} near {buf[pos:pos + 40]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind not in ('ws', 'comment'):
+            yield kind, match.group()
+
+
+class _Parser:
+    def __init__(self, tokens: Iterator[Tuple[str, str]]):
+        self.tokens = tokens
+        self.lookahead: Optional[Tuple[str, str]] = None
+
+    def next(self) -> Tuple[str, str]:
+        if self.lookahead is not None:
+            token, self.lookahead = self.lookahead, None
+            return token
+        token = next(self.tokens, None)
+        if token is None:
+            raise JSSyntaxError("Unexpected end of input")
+        return token
+
+    def peek(self) -> Tuple[str, str]:
+        if self.lookahead is None:
+            self.lookahead = self.next()
+        return self.lookahead
+
+    def expect(self, text: str):
+        kind, value = self.next()
+        if value != text or kind != 'punct':
+            raise JSSyntaxError(f"Expected {text!r}, got {value!r}")
+
+    def value(self) -> Any:
+        kind, text = self.next()
+        if kind == 'string':
+            return decode_string(text)
+        if kind == 'number':
+            if text.lstrip('-')[:2] in ('0x', '0X'):
+                return int(text, 16)
+            return float(text) if any(c in text for c in '.eE') else int(text)
+        if kind == 'ident' and text in _CONSTANTS:
+            return _CONSTANTS[text]
+        if text == '{':
+            return self.object()
+        if text == '[':
+            return list(self.elements())
+        raise JSSyntaxError(f"Unexpected token {text!r}")
+
+    def object(self) -> dict:
+        result = {}
+        while True:
+            kind, text = self.next()
+            if text == '}' and kind == 'punct':
+                return result
+            if kind == 'string':
+                key = decode_string(text)
+            elif kind in ('ident', 'number'):
+                key = text
+            else:
+                raise JSSyntaxError(f"Unexpected object key {text!r}")
+            self.expect(':')
+            result[key] = self.value()
+            kind, text = self.next()
+            if text == '}' and kind == 'punct':
+                return result
+            if text != ',' or kind != 'punct':
+                raise JSSyntaxError(f"Expected ',' or '}}', got {text!r}")
+
+    def elements(self) -> Iterator[Any]:
+        """Yield array elements after an opening '[', up to and including ']'"""
+        while True:
+            if self.peek() == ('punct', ']'):
+                self.next()
+                return
+            yield self.value()
+            kind, text = self.next()
+            if text == ']' and kind == 'punct':
+                return
+            if text != ',' or kind != 'punct':
+                raise JSSyntaxError(f"Expected ',' or ']', got {text!r}")
+
+
+def iter_array_items(f: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of the first array literal in a JS module, one at a time"""
+    parser = _Parser(iter_tokens(f, chunk_size))
+    for kind, text in parser.tokens:
+        if kind == 'punct' and text == '[':
+            yield from parser.elements()
+            return
+    raise JSSyntaxError("No array literal found")
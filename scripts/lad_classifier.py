@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Shared keyword classifier for the Dr. Lad extractors.
+
+determine_dosha, determine_category and determine_severity used to be
+copied into every LAD script, each one re-joining and lowercasing the
+section text and then testing every keyword of its own table. A
+KeywordClassifier merges all three tables into one deduplicated vocabulary
+with a sparse keyword -> label table, so each section text is lowercased
+once, every distinct keyword is looked up once, and the three label families
+are scored together from that single pass.
+
+Matching keeps the original substring semantics ('ear' matches 'hearing'),
+so each script gets exactly the labels it produced before.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Family indices in the sparse table
+DOSHA, SEVERITY = 0, 1
+
+DEFAULT_DOSHA = ['Vata']
+DEFAULT_CATEGORY = 'General'
+DEFAULT_SEVERITY = 'Mild to Moderate'
+
+# (disease_name, symptoms, causes, content)
+Section = Tuple[str, List[str], List[str], str]
+
+
+class KeywordClassifier:
+    """
+    Scores doshas (by keyword count, ties kept), and picks the first category
+    and severity (in table order) with any keyword present.
+    """
+
+    def __init__(self, dosha_keywords: Dict[str, List[str]], category_keywords: Dict[str, List[str]],
+                 severity_keywords: Optional[Dict[str, List[str]]] = None):
+        self.doshas = list(dosha_keywords)
+        self.categories = list(category_keywords)
+        self.severities = list(severity_keywords or {})
+
+        # keyword -> [(family, label index)]: the non-zero entries of the
+        # keyword x label incidence matrix, grouped by row. Doshas and severity
+        # are matched against the full section text, categories against the
+        # name + symptoms text, so each text gets its own table.
+        self.text_rows: Dict[str, List[Tuple[int, int]]] = {}
+        for family, table in ((DOSHA, dosha_keywords), (SEVERITY, severity_keywords or {})):
+            for label, keywords in enumerate(table.values()):
+                for keyword in dict.fromkeys(keywords):
+                    self.text_rows.setdefault(keyword, []).append((family, label))
+
+        self.category_rows: Dict[str, List[int]] = {}
+        for label, keywords in enumerate(category_keywords.values()):
+            for keyword in dict.fromkeys(keywords):
+                self.category_rows.setdefault(keyword, []).append(label)
+
+    def _scores(self, text: str, category_text: str) -> Tuple[List[int], List[bool], List[bool]]:
+        dosha_scores = [0] * len(self.doshas)
+        category_hits = [False] * len(self.categories)
+        severity_hits = [False] * len(self.severities)
+
+        for keyword, entries in self.text_rows.items():
+            if keyword in text:
+                for family, label in entries:
+                    if family == DOSHA:
+                        dosha_scores[label] += 1
+                    else:
+                        severity_hits[label] = True
+
+        for keyword, labels in self.category_rows.items():
+            if keyword in category_text:
+                for label in labels:
+                    category_hits[label] = True
+
+        return dosha_scores, category_hits, severity_hits
+
+    def classify(self, disease_name: str, symptoms: List[str], causes: List[str],
+                 content: str) -> Dict[str, object]:
+        """Return {'dosha': [...], 'category': ..., 'severity': ...} for one section"""
+        text = ' '.join(symptoms + causes + [content]).lower()
+        category_text = (disease_name + ' ' + ' '.join(symptoms)).lower()
+        dosha_scores, category_hits, severity_hits = self._scores(text, category_text)
+
+        max_score = max(dosha_scores, default=0)
+        if max_score == 0:
+            dosha = list(DEFAULT_DOSHA)
+        else:
+            dosha = [d for d, score in zip(self.doshas, dosha_scores) if score == max_score]
+
+        category = next((c for c, hit in zip(self.categories, category_hits) if hit), DEFAULT_CATEGORY)
+        severity = next((s for s, hit in zip(self.severities, severity_hits) if hit), DEFAULT_SEVERITY)
+        return {'dosha': dosha, 'category': category, 'severity': severity}
+
+    def classify_many(self, sections: Iterable[Section]) -> List[Dict[str, object]]:
+        """Classify a batch of (disease_name, symptoms, causes, content) sections"""
+        return [self.classify(*section) for section in sections]
+
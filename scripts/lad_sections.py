@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Streaming section segmentation for the Dr. Lad extractors.
+
+The extractors used to concatenate every page into one string and run
+re.split over it. The helpers here consume pages line by line instead,
+detect headings incrementally (including across page boundaries) and hand
+back each section as soon as the next heading closes it, so memory stays
+bounded by the size of a single section rather than the whole book.
+"""
+
+import re
+from collections import deque
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+def iter_lines(pages: Iterable[Optional[str]]) -> Iterator[str]:
+    """
+    Yield the lines of all non-empty pages, exactly as
+    ''.join(page + "\\n" for page in pages if page).split("\\n") would
+    """
+    any_page = False
+    for page_text in pages:
+        if page_text:
+            any_page = True
+            yield from page_text.split('\n')
+    if any_page:
+        yield ''
+
+
+class StartAt:
+    """
+    Line filter equivalent to text[text.find(marker):]: drops everything before
+    the first occurrence of `marker`. `found` tells whether the marker was seen.
+    """
+
+    def __init__(self, lines: Iterable[str], marker: str):
+        self.lines = lines
+        self.marker = marker
+        self.found = False
+
+    def __iter__(self) -> Iterator[str]:
+        for line in self.lines:
+            if not self.found:
+                idx = line.find(self.marker)
+                if idx == -1:
+                    continue
+                self.found = True
+                line = line[idx:]
+            yield line
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[str]:
+    """Yield blank-line separated blocks, equivalent to text.split('\\n\\n')"""
+    block = []
+    for line in lines:
+        if line:
+            block.append(line)
+        elif block:
+            yield '\n'.join(block)
+            block = []
+    if block:
+        yield '\n'.join(block)
+
+
+def iter_heading_sections(lines: Iterable[str], heading_class: str,
+                          follow: Optional[str] = None) -> Iterator[Tuple[Optional[str], str]]:
+    """
+    Streaming equivalent of re.split(r"\\n([A-Z][<heading_class>]+)\\n(?:<follow>)", text).
+
+    Yields (heading, content) pairs: first (None, preamble), then one pair per
+    heading with the raw heading text and the content up to the next heading.
+    Like the regex, a heading may span several consecutive lines, a heading
+    cannot start on the line right after a previous heading's terminating
+    newline, and a matched `follow` prefix is consumed from the next line.
+    """
+    first_line_re = re.compile(rf"[A-Z][{heading_class}]*")
+    continuation_re = re.compile(rf"[{heading_class}]*")
+    heading_re = re.compile(rf"[A-Z][{heading_class}]+")
+    follow_re = re.compile(follow) if follow else None
+
+    source = iter(lines)
+    pending = deque()
+
+    def next_line():
+        if pending:
+            return pending.popleft()
+        return next(source, None)
+
+    heading = None
+    content = []
+    # Whether the newline before the current line is still available to start a match
+    newline_available = False
+
+    line = next_line()
+    while line is not None:
+        if not (newline_available and first_line_re.fullmatch(line)):
+            content.append(line)
+            newline_available = True
+            line = next_line()
+            continue
+
+        # Collect the run of lines the heading class can absorb
+        run = [line]
+        nxt = next_line()
+        while nxt is not None and continuation_re.fullmatch(nxt):
+            run.append(nxt)
+            nxt = next_line()
+
+        if nxt is None:
+            # The regex needs a newline after the heading, so at end of input
+            # the last absorbed line becomes content
+            if follow_re is None and len(run) >= 2 and heading_re.fullmatch('\n'.join(run[:-1])):
+                yield heading, '\n'.join(content)
+                heading, content = '\n'.join(run[:-1]), [run[-1]]
+            elif follow_re is None and len(run) >= 2:
+                # Too short to be a heading on its own: retry from the next line
+                content.append(run[0])
+                pending.extend(run[1:])
+                newline_available = True
+                line = next_line()
+                continue
+            else:
+                content.extend(run)
+            break
+
+        candidate = '\n'.join(run)
+        follow_match = follow_re.match(nxt) if follow_re else None
+        if heading_re.fullmatch(candidate) and (follow_re is None or follow_match):
+            yield heading, '\n'.join(content)
+            heading = candidate
+            content = [nxt[follow_match.end():] if follow_match else nxt]
+            newline_available = True
+        else:
+            # A shorter run fails for the same reason, so none of these lines
+            # can start a heading
+            content.extend(run)
+            content.append(nxt)
+            newline_available = True
+        line = next_line()
+
+    yield heading, '\n'.join(content)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Compiled scanner for disease mentions and typed keywords in running text.
+
+Behaves as if the text were split on '.', each sentence stripped, sentences
+shorter than min_chars dropped, and every mention pattern run over every
+sentence in turn with findall - but the patterns run once over the whole
+text and only sentences that contain a mention are looked at further. For
+those, a single keyword regex emits typed tokens (e.g. dosha 'vata',
+treatment 'herbal'), so each keyword group costs one pass, not one
+substring test per keyword.
+
+Mention patterns must not be able to match across a '.', so that whole-text
+matches are exactly the per-sentence ones.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+
+class SentenceMentions(NamedTuple):
+    sentence: str
+    # (pattern index, groups) in per-sentence findall order
+    mentions: List[Tuple[int, Tuple[str, ...]]]
+    # keyword group -> labels found in the sentence, in declaration order
+    tags: Dict[str, List[str]]
+
+
+class MentionScanner:
+    def __init__(self, mention_patterns: Sequence[str], keyword_groups: Dict[str, Dict[str, List[str]]],
+                 min_chars: int = 20, flags: int = re.IGNORECASE):
+        self.patterns = [re.compile(pattern, flags) for pattern in mention_patterns]
+        self.min_chars = min_chars
+        self.groups = keyword_groups
+
+        # A keyword found at a position implies every keyword that is a prefix
+        # of it, and the longest one wins the alternation, so fold prefixes in
+        labels_by_keyword: Dict[str, set] = {}
+        for group, labels in keyword_groups.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    labels_by_keyword.setdefault(keyword.lower(), set()).add((group, label))
+        self.keyword_tags = {
+            keyword: frozenset().union(*(tags for other, tags in labels_by_keyword.items() if keyword.startswith(other)))
+            for keyword in labels_by_keyword
+        }
+        alternation = '|'.join(re.escape(k) for k in sorted(self.keyword_tags, key=len, reverse=True))
+        self.keyword_re = re.compile(f'(?=({alternation}))')
+
+    def tag(self, sentence_lower: str) -> Dict[str, List[str]]:
+        found = set()
+        for match in self.keyword_re.finditer(sentence_lower):
+            found |= self.keyword_tags[match.group(1)]
+        return {group: [label for label in labels if (group, label) in found]
+                for group, labels in self.groups.items()}
+
+    def scan(self, text: str) -> Iterator[SentenceMentions]:
+        """Yield the sentences that contain mentions, in text order"""
+        dots = [m.start() for m in re.finditer(r'\.', text)]
+        # Patterns run in order and finditer is left to right, so each sentence's
+        # list is already in per-sentence findall order
+        by_sentence: Dict[int, List[Tuple[int, Tuple[str, ...]]]] = {}
+        for index, pattern in enumerate(self.patterns):
+            for match in pattern.finditer(text):
+                sentence = bisect_right(dots, match.start())
+                by_sentence.setdefault(sentence, []).append((index, match.groups()))
+
+        for sentence_index in sorted(by_sentence):
+            start = dots[sentence_index - 1] + 1 if sentence_index else 0
+            end = dots[sentence_index] if sentence_index < len(dots) else len(text)
+            sentence = text[start:end].strip()
+            if len(sentence) < self.min_chars:
+                continue
+            yield SentenceMentions(sentence, by_sentence[sentence_index], self.tag(sentence.lower()))
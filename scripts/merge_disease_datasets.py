@@ -1,6 +1,23 @@
+"""
+Merge the JS disease modules in backend/data into disease_database.json.
+
+Sources are parsed concurrently and each one's records are kept in the cache
+directory under the SHA-256 of the module, so only modules that changed since
+the last run are parsed again. The manifest next to the output records each
+source's hash plus a content hash per merged record, in output order; the
+order is stable (JS_FILES order, then the order inside each module), so the
+seed scripts and the Mongo import can diff two runs instead of reloading.
+When no source changed and the output is intact, nothing is rewritten.
+"""
+
+import hashlib
 import os
-import re
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+from ayur_config import CACHE_DIR, default_workers
+from data_files import atomic_open, file_sha256, write_json_array
+from js_literals import iter_array_items
 
 DATA_DIR = os.path.join('backend', 'data')
 JS_FILES = [
@@ -10,42 +27,110 @@ JS_FILES = [
     'diseases_part1.js',
 ]
 OUTPUT_FILE = os.path.join(DATA_DIR, 'disease_database.json')
+MANIFEST_FILE = os.path.join(DATA_DIR, 'disease_database.manifest.json')
+PARSED_DIR = os.path.join(CACHE_DIR, 'merged_sources')
+
+# Bump when parsing changes, so sources cached by an older parser are re-parsed
+PARSER_VERSION = 1
+
+def iter_js_array(path):
+    # Stream the elements of the module's array literal without loading the file
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_array_items(f)
+
+def record_hash(record):
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def record_id(record):
+    if isinstance(record, dict):
+        return record.get('diseaseId') or record.get('id') or record.get('name')
+    return None
+
+def parsed_path(source_hash):
+    return os.path.join(PARSED_DIR, f"{source_hash}-v{PARSER_VERSION}.jsonl")
+
+def parse_source(args):
+    """Worker entry point: parse one module into its JSON Lines cache file"""
+    path, source_hash = args
+    count = 0
+    with atomic_open(parsed_path(source_hash)) as out:
+        for record in iter_js_array(path):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    return count
 
-def extract_array_from_js(js_content):
-    # Remove module.exports and variable assignment
-    js_content = re.sub(r'^(const|let|var)\s+\w+\s*=\s*', '', js_content, flags=re.MULTILINE)
-    js_content = re.sub(r'module\.exports\s*=\s*\w+;?\s*$', '', js_content, flags=re.MULTILINE)
-    # Remove trailing semicolon if present
-    js_content = js_content.strip().rstrip(';')
-    # Try to parse as JSON
+def iter_parsed(source_hash):
+    with open(parsed_path(source_hash), 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+def load_manifest():
     try:
-        return json.loads(js_content)
-    except Exception:
-        # Try to fix single quotes and trailing commas
-        js_content = js_content.replace("'", '"')
-        js_content = re.sub(r',\s*([}\]])', r'\1', js_content)
-        return json.loads(js_content)
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
 
 def main():
-    merged = []
-    total = 0
+    os.makedirs(PARSED_DIR, exist_ok=True)
+    previous = load_manifest()
+
+    # Hash every source; only those without a parsed cache entry need parsing
+    hashes = {}
     for fname in JS_FILES:
         path = os.path.join(DATA_DIR, fname)
         if not os.path.exists(path):
             print(f"[WARN] {fname} not found, skipping.")
             continue
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        try:
-            arr = extract_array_from_js(content)
-            merged.extend(arr)
-            print(f"[INFO] {fname}: {len(arr)} diseases merged.")
-            total += len(arr)
-        except Exception as e:
-            print(f"[ERROR] Failed to parse {fname}: {e}")
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(merged, f, indent=2, ensure_ascii=False)
-    print(f"[DONE] Merged {total} diseases into {OUTPUT_FILE}")
+        hashes[fname] = file_sha256(path)
+    stale = [fname for fname, source_hash in hashes.items() if not os.path.exists(parsed_path(source_hash))]
+
+    failed = set()
+    if stale:
+        jobs = [(os.path.join(DATA_DIR, fname), hashes[fname]) for fname in stale]
+        workers = min(default_workers(), len(jobs))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {fname: executor.submit(parse_source, job) for fname, job in zip(stale, jobs)}
+            for fname, future in futures.items():
+                try:
+                    future.result()
+                    print(f"[INFO] {fname}: parsed.")
+                except Exception as e:
+                    print(f"[ERROR] Failed to parse {fname}: {e}")
+                    failed.add(fname)
+    sources = {fname: source_hash for fname, source_hash in hashes.items() if fname not in failed}
+
+    output_intact = os.path.exists(OUTPUT_FILE) and file_sha256(OUTPUT_FILE) == previous.get('output_sha256')
+    unchanged = (previous.get('parser_version') == PARSER_VERSION
+                 and {f: s['sha256'] for f, s in previous.get('sources', {}).items()} == sources)
+    if unchanged and output_intact:
+        total = sum(s['records'] for s in previous['sources'].values())
+        print(f"[DONE] No source changed; {OUTPUT_FILE} is up to date ({total} diseases)")
+        return
+
+    manifest = {'parser_version': PARSER_VERSION, 'sources': {}, 'records': []}
+
+    def merged_records():
+        for fname in JS_FILES:
+            if fname not in sources:
+                continue
+            count = 0
+            for record in iter_parsed(sources[fname]):
+                manifest['records'].append({'id': record_id(record), 'source': fname,
+                                            'sha256': record_hash(record)})
+                count += 1
+                yield record
+            manifest['sources'][fname] = {'sha256': sources[fname], 'records': count}
+            print(f"[INFO] {fname}: {count} diseases merged.")
+
+    with atomic_open(OUTPUT_FILE) as out:
+        write_json_array(out, merged_records(), ensure_ascii=False)
+
+    manifest['output_sha256'] = file_sha256(OUTPUT_FILE)
+    with atomic_open(MANIFEST_FILE) as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    print(f"[DONE] Merged {len(manifest['records'])} diseases into {OUTPUT_FILE}")
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Lazily loaded, shared spaCy pipelines.
+
+Importing spaCy and loading en_core_web_sm takes seconds, so no script does
+either at import time. load_model() loads a model the first time it is asked
+for and returns the same pipeline for the rest of the process, so read-only
+users share one copy. Callers that add components or patterns take their own
+pipeline from new_model() or blank() instead of changing the shared one.
+"""
+
+from functools import lru_cache
+
+DEFAULT_MODEL = 'en_core_web_sm'
+
+
+@lru_cache(maxsize=None)
+def load_model(name: str = DEFAULT_MODEL):
+    """The named spaCy pipeline, loaded on first use; raises OSError if it is not installed"""
+    import spacy
+    return spacy.load(name)
+
+
+def new_model(name: str = DEFAULT_MODEL):
+    """A private copy of the named pipeline (not cached, since callers change it)"""
+    import spacy
+    return spacy.load(name)
+
+
+def blank(lang: str = 'en'):
+    """A new empty pipeline (not cached, since callers add their own components)"""
+    import spacy
+    return spacy.blank(lang)
+
+
+def missing_model_hint(name: str = DEFAULT_MODEL) -> str:
+    return f"spaCy model '{name}' not found. Install it with: python -m spacy download {name}"
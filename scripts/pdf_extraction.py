@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Common PDF text extraction engine for the data scripts.
+
+Page ranges are sharded across a process pool and the text is reassembled in
+page order. Each worker opens the PDF itself, so only page text crosses process
+boundaries. Results go through the on-disk page cache in pdf_text_cache.py, so
+pages that were already extracted are never parsed again, and iter_pages()
+hands pages out one at a time so callers never need the whole book in memory.
+
+Run as a script to fill the cache ahead of time, e.g. before several
+extractors that read the same PDF start at once:
+
+    python scripts/pdf_extraction.py book.pdf --start-page 120
+"""
+
+import argparse
+import mmap
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from ayur_config import default_workers
+from pdf_text_cache import PageTextCache
+
+BACKENDS = ('pdfplumber', 'pypdf2', 'pymupdf')
+
+
+def _open(pdf_path: str, backend: str):
+    # Backends are imported lazily: each script only needs the reader it uses,
+    # and fully cached runs need none of them
+    if backend == 'pdfplumber':
+        import pdfplumber
+        return pdfplumber.open(pdf_path)
+    if backend == 'pypdf2':
+        import PyPDF2
+        return PyPDF2.PdfReader(pdf_path)
+    if backend == 'pymupdf':
+        import fitz  # PyMuPDF
+        return fitz.open(pdf_path)
+    raise ValueError(f"Unknown PDF backend: {backend}")
+
+
+def _close(pdf, backend: str):
+    if backend in ('pdfplumber', 'pymupdf'):
+        pdf.close()
+
+
+def _page_count(pdf, backend: str) -> int:
+    if backend == 'pymupdf':
+        return pdf.page_count
+    return len(pdf.pages)
+
+
+def _page_text(pdf, backend: str, page_number: int) -> str:
+    if backend == 'pymupdf':
+        return pdf[page_number].get_text()
+    return pdf.pages[page_number].extract_text() or ''
+
+
+def count_pages(pdf_path: str, backend: str = 'pdfplumber') -> int:
+    pdf = _open(pdf_path, backend)
+    try:
+        return _page_count(pdf, backend)
+    finally:
+        _close(pdf, backend)
+
+
+def _extract_shard(args: Tuple[str, str, List[int]]) -> List[str]:
+    """Worker entry point: extract one contiguous run of pages"""
+    pdf_path, backend, page_numbers = args
+    pdf = _open(pdf_path, backend)
+    try:
+        return [_page_text(pdf, backend, n) for n in page_numbers]
+    finally:
+        _close(pdf, backend)
+
+
+def shard_pages(page_numbers: List[int], shards: int) -> List[List[int]]:
+    """Split pages into at most `shards` contiguous, evenly sized runs"""
+    shards = max(1, min(shards, len(page_numbers)))
+    size, extra = divmod(len(page_numbers), shards)
+    result = []
+    start = 0
+    for i in range(shards):
+        end = start + size + (1 if i < extra else 0)
+        result.append(page_numbers[start:end])
+        start = end
+    return [shard for shard in result if shard]
+
+
+def iter_pages_uncached(pdf_path: str, page_numbers: List[int], backend: str = 'pdfplumber',
+                        workers: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of the given pages in order, extracted across `workers` processes"""
+    workers = workers or default_workers('AYUR_PDF_WORKERS')
+    if workers <= 1 or len(page_numbers) <= 1:
+        pdf = _open(pdf_path, backend)
+        try:
+            for n in page_numbers:
+                yield _page_text(pdf, backend, n)
+        finally:
+            _close(pdf, backend)
+        return
+
+    # A few shards per worker keeps the pool busy when some pages are slower;
+    # executor.map hands shards back in order as they complete
+    shards = shard_pages(page_numbers, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_texts in executor.map(_extract_shard, [(pdf_path, backend, shard) for shard in shards]):
+            yield from shard_texts
+
+
+def iter_pages(pdf_path: str, start_page: int = 0, end_page: Optional[int] = None,
+               backend: str = 'pdfplumber', workers: Optional[int] = None,
+               use_cache: bool = True) -> Iterator[str]:
+    """
+    Yield the text of pages [start_page, end_page) of a PDF, one page at a time.
+    Cached pages are read from disk; only missing pages are parsed, in parallel.
+    """
+    if not use_cache:
+        page_count = count_pages(pdf_path, backend)
+        page_numbers = list(range(start_page, min(end_page or page_count, page_count)))
+        yield from iter_pages_uncached(pdf_path, page_numbers, backend, workers)
+        return
+
+    cache, page_numbers = warm_cache(pdf_path, start_page, end_page, backend, workers)
+    for n in page_numbers:
+        yield cache.get(n) or ''
+
+
+def warm_cache(pdf_path: str, start_page: int = 0, end_page: Optional[int] = None,
+               backend: str = 'pdfplumber', workers: Optional[int] = None) -> Tuple[PageTextCache, List[int]]:
+    """
+    Extract the uncached pages of [start_page, end_page) into the page cache.
+    Returns the cache and the page numbers of the range.
+    """
+    cache = PageTextCache.for_file(pdf_path, extractor=backend)
+    page_count = cache.get_page_count()
+    if page_count is None:
+        page_count = count_pages(pdf_path, backend)
+        cache.set_page_count(page_count)
+
+    page_numbers = list(range(start_page, min(end_page or page_count, page_count)))
+    missing = cache.missing(page_numbers)
+    if missing:
+        print(f"Extracting {len(missing)} uncached pages from {pdf_path}...")
+        for page_number, text in zip(missing, iter_pages_uncached(pdf_path, missing, backend, workers)):
+            cache.put(page_number, text)
+    return cache, page_numbers
+
+
+def extract_pages(pdf_path: str, start_page: int = 0, end_page: Optional[int] = None,
+                  backend: str = 'pdfplumber', workers: Optional[int] = None,
+                  use_cache: bool = True) -> List[str]:
+    """Return the text of pages [start_page, end_page) of a PDF as a list, in page order"""
+    return list(iter_pages(pdf_path, start_page, end_page, backend, workers, use_cache))
+
+
+def extract_text(pdf_path: str, backend: str = 'pdfplumber', workers: Optional[int] = None,
+                 separator: str = '') -> str:
+    """Extract a whole PDF as one string, joining pages with `separator`"""
+    return separator.join(iter_pages(pdf_path, backend=backend, workers=workers))
+
+
+@contextmanager
+def spool_pdf(data: bytes) -> Iterator[Tuple[str, mmap.mmap]]:
+    """
+    Write a downloaded PDF to a temporary spool file and yield (path, mmap).
+    Readers parse from the memory-mapped file and OCR workers open the path,
+    so no further in-memory copies of the document are made.
+    """
+    fd, path = tempfile.mkstemp(suffix='.pdf', dir=os.environ.get('AYUR_SPOOL_DIR'))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield path, mapped
+        finally:
+            mapped.close()
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the page text cache for a PDF")
+    parser.add_argument('pdf')
+    parser.add_argument('--start-page', type=int, default=0)
+    parser.add_argument('--end-page', type=int)
+    parser.add_argument('--backend', choices=BACKENDS, default='pdfplumber')
+    parser.add_argument('--workers', type=int, help="processes to extract with (default: AYUR_PDF_WORKERS, AYUR_WORKERS or CPU count)")
+    args = parser.parse_args()
+    _, page_numbers = warm_cache(args.pdf, args.start_page, args.end_page, args.backend, args.workers)
+    print(f"{len(page_numbers)} pages of {args.pdf} cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+OCR fallback for PDF pages that have no extractable text.
+
+Only the requested pages are rasterized, one page at a time, and the OCR runs
+across a process pool using the same sharding as pdf_extraction.py. Results
+are stored in the on-disk page cache (pdf_text_cache.py) keyed by document
+hash, page and DPI, so a page is OCR'd once no matter how often it is crawled.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ayur_config import default_workers
+from pdf_extraction import shard_pages
+from pdf_text_cache import PageTextCache
+
+DEFAULT_DPI = 200
+
+
+def ocr_extractor_name(dpi: int) -> str:
+    """Cache extractor name; the DPI is part of it since it changes the OCR output"""
+    return f"tesseract-{dpi}dpi"
+
+
+def _ocr_shard(args: Tuple[str, int, List[int]]) -> List[str]:
+    """Worker entry point: rasterize and OCR each page of one shard"""
+    # Imported lazily so fully cached runs need neither poppler nor tesseract
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    pdf_path, dpi, page_numbers = args
+    texts = []
+    for n in page_numbers:
+        images = convert_from_path(pdf_path, dpi=dpi, first_page=n + 1, last_page=n + 1)
+        texts.append(''.join(pytesseract.image_to_string(image) for image in images))
+    return texts
+
+
+def ocr_pages_uncached(pdf_path: str, page_numbers: List[int], dpi: int = DEFAULT_DPI,
+                       workers: Optional[int] = None) -> List[str]:
+    """OCR the given pages, in order, across `workers` processes"""
+    workers = workers or default_workers('AYUR_PDF_WORKERS')
+    if workers <= 1 or len(page_numbers) <= 1:
+        return _ocr_shard((pdf_path, dpi, page_numbers))
+
+    shards = shard_pages(page_numbers, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_ocr_shard, [(pdf_path, dpi, shard) for shard in shards])
+        return [text for shard_texts in results for text in shard_texts]
+
+
+def ocr_pages(pdf_path: str, page_numbers: List[int], dpi: int = DEFAULT_DPI,
+              workers: Optional[int] = None) -> Dict[int, str]:
+    """
+    Return {page_number: text} for the given 0-indexed pages of a PDF file.
+    Cached pages are read from disk; only missing pages are rasterized and OCR'd.
+    """
+    cache = PageTextCache.for_file(pdf_path, extractor=ocr_extractor_name(dpi))
+    missing = cache.missing(page_numbers)
+    if missing:
+        for page_number, text in zip(missing, ocr_pages_uncached(pdf_path, missing, dpi, workers)):
+            cache.put(page_number, text)
+
+    return {n: cache.get(n) or '' for n in page_numbers}
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Persistent page-level text cache for PDF extraction.
+
+Extracted page text is stored on disk under the SHA-256 of the PDF contents,
+the extractor name and its version, one file per page. Re-running a script
+against an unchanged book reads pre-extracted text straight from disk, and
+only pages without a cache entry are parsed again.
+"""
+
+import json
+import os
+from typing import List, Optional
+
+from ayur_config import CACHE_DIR
+from data_files import atomic_open, file_sha256
+
+# Bump when the way page text is produced changes, so stale entries are ignored
+# (v2: page text is stored with its line endings untranslated)
+EXTRACTOR_VERSION = 2
+
+
+class PageTextCache:
+    """Page text store for one document, extractor and extractor version"""
+
+    def __init__(self, doc_hash: str, extractor: str = 'pdfplumber',
+                 version: int = EXTRACTOR_VERSION, cache_dir: Optional[str] = None):
+        self.doc_hash = doc_hash
+        self.extractor = extractor
+        self.version = version
+        self.doc_dir = os.path.join(cache_dir or CACHE_DIR, 'pdf_text', doc_hash)
+        self.directory = os.path.join(self.doc_dir, f"{extractor}-v{version}")
+
+    @classmethod
+    def for_file(cls, pdf_path: str, **kwargs) -> 'PageTextCache':
+        return cls(file_sha256(pdf_path), **kwargs)
+
+    def _page_path(self, page_number: int) -> str:
+        return os.path.join(self.directory, f"{page_number:05d}.txt")
+
+    def get(self, page_number: int) -> Optional[str]:
+        """Return cached text for a page, or None if it has not been extracted"""
+        try:
+            # newline='' on both sides, so '\r\n' and '\r' come back exactly as extracted
+            with open(self._page_path(page_number), 'r', encoding='utf-8', newline='') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, page_number: int, text: Optional[str]):
+        """Store a page's text; pages without text are cached as empty strings"""
+        os.makedirs(self.directory, exist_ok=True)
+        with atomic_open(self._page_path(page_number), newline='') as f:
+            f.write(text or '')
+
+    def missing(self, page_numbers: List[int]) -> List[int]:
+        return [n for n in page_numbers if not os.path.exists(self._page_path(n))]
+
+    def get_page_count(self) -> Optional[int]:
+        try:
+            with open(os.path.join(self.doc_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)['page_count']
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    def set_page_count(self, page_count: int):
+        os.makedirs(self.doc_dir, exist_ok=True)
+        with atomic_open(os.path.join(self.doc_dir, 'meta.json')) as f:
+            json.dump({'page_count': page_count}, f)
+
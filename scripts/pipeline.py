@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the data refresh: runs the extraction and generation
+scripts as a dependency graph, make-style.
+
+Each step declares the files it reads and writes (paths from the repository
+root; a directory counts as all the files under it). A step depends on the
+steps producing its inputs. Before running, a step's signature is computed
+from the hashes of its scripts, the sibling modules they import, and its
+inputs; if the signature and the output hashes match the last successful
+run, the step is skipped, as is a step none of whose inputs exist.
+Independent steps run in parallel, each script in its own process with its
+output captured to a log file.
+
+    python scripts/pipeline.py                 # bring everything up to date
+    python scripts/pipeline.py disease_pdf -j 2
+    python scripts/pipeline.py --dry-run       # show what would run
+    python scripts/pipeline.py --force enhance
+
+Not part of the graph: scrape_ayurveda.py (a network crawl with its own
+HTTP cache), comprehensive_yoga_extraction.py (superseded by
+extract_yoga_data.py for the same output), and the one-off editors of
+src/assets/comprehensiveYogaPoses.ts (add_missing_poses, cleanup_yoga_poses,
+fix_yoga_file, update_colors, update_image_paths), which patch the file in
+place and are not meant to be re-run.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from ayur_config import CACHE_DIR
+from data_files import atomic_open, file_sha256
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+STATE_DIR = os.path.join(CACHE_DIR, 'pipeline')
+STATE_FILE = os.path.join(STATE_DIR, 'state.json')
+LOG_DIR = os.path.join(STATE_DIR, 'logs')
+
+# Bump to invalidate every recorded run
+PIPELINE_VERSION = 1
+
+LAD_PDF = 'The_Complete_Book_of_Ayurvedic_Home_Remedies.pdf'
+
+
+class Step(NamedTuple):
+    name: str
+    scripts: Tuple[str, ...]  # run in order: paths from the repository root, optionally with arguments
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    cwd: str = '.'  # where the scripts expect to be run from
+    after: Tuple[str, ...] = ()  # steps to wait for that share no files with this one
+
+
+STEPS = [
+    # Diseases
+    # The four LAD extractors read the same cached pages; filling the cache
+    # once up front stops each of them extracting the book with its own pool
+    Step('lad_page_cache', (f'scripts/pdf_extraction.py {LAD_PDF} --start-page 120',), (LAD_PDF,)),
+    Step('lad_pdf', ('scripts/extract_lad_pdf.py',), (LAD_PDF,), ('backend/data/diseases_lad.json',),
+         after=('lad_page_cache',)),
+    Step('lad_simple', ('scripts/extract_lad_diseases_simple.py',), (LAD_PDF,),
+         ('backend/data/diseases_lad_simple.json',), after=('lad_page_cache',)),
+    Step('lad_comprehensive', ('scripts/extract_lad_diseases_comprehensive.py',), (LAD_PDF,),
+         ('backend/data/diseases_lad_comprehensive.json',), after=('lad_page_cache',)),
+    Step('lad_refined', ('scripts/extract_lad_diseases_refined.py',), (LAD_PDF,),
+         ('backend/data/diseases_lad_refined.json',), after=('lad_page_cache',)),
+    Step('lad_actual', ('scripts/extract_lad_actual_diseases.py',), (),
+         ('backend/data/lad_actual_diseases.json',)),
+    Step('classical', ('scripts/extract_comprehensive_diseases.py',), (),
+         ('backend/data/comprehensive_classical_diseases.json',)),
+    Step('enhance', ('scripts/enhance_disease_data.py',),
+         ('src/Scientific_Basis_for_Ayurvedic_Therapies.pdf', 'src/The-Complete-Book-of-Ayurvedic-Home-Remedies.pdf',
+          'backend/data/common_global_diseases_fixed.json'),
+         ('backend/data/enhanced_diseases.json',)),
+    Step('merge', ('scripts/merge_disease_datasets.py',),
+         ('backend/data/ayurvedicDiseases.js', 'backend/data/comprehensiveDiseases.js',
+          'backend/data/comprehensiveAyurvedicDiseases.js', 'backend/data/diseases_part1.js'),
+         ('backend/data/disease_database.json', 'backend/data/disease_database.manifest.json')),
+    Step('disease_pdf', ('generate_pdf.py',), ('backend/data/disease_database.json',), ('backend/diseases.pdf',)),
+
+    # Yoga
+    Step('yoga_final', ('scripts/final_yoga_extraction.py',), (), ('src/assets/final_yoga_data.json',), 'scripts'),
+    Step('yoga_manual', ('scripts/extract_yoga_poses_manual.py',), (), ('src/assets/enhanced_yoga_data.json',),
+         'scripts'),
+    Step('yoga_pdf', ('scripts/extract_yoga_from_pdf.py',), ('src/pdfcoffee.com-davidfrawleyyogaandayurvedapdf.pdf',),
+         ('src/assets/extracted_yoga_data.json', 'src/assets/yoga_types.ts'), 'scripts'),
+    Step('yoga_library', ('scripts/create_comprehensive_yoga_library.py',), (),
+         ('src/assets/comprehensive_yoga_library.json',)),
+    Step('yoga_comprehensive', ('scripts/extract_yoga_data.py',),
+         ('public/David-Frawley-Sandra-Summerfield-Kozak-Yoga-For-Your-Type-An-Ayurvedic-Approach-To-Your-Asana-Practice-autoocr.pdf',),
+         ('src/assets/comprehensive_yoga_data.json', 'src/assets/public/yoga-poses')),
+    # Both scripts write pages into the same directory, so they are one step
+    Step('pose_pages', ('scripts/generate_pose_images.py', 'scripts/generate_additional_poses.py'), (),
+         ('public/yoga-poses',), 'scripts'),
+]
+
+_IMPORT_RE = re.compile(r'^\s*(?:from\s+(\w+)\s+import|import\s+(\w+))', re.M)
+
+
+def _abs(path: str) -> str:
+    return os.path.join(REPO_ROOT, path)
+
+
+def path_hash(path: str) -> Optional[str]:
+    """SHA-256 of a file, or of a directory's relative paths and file hashes; None if missing"""
+    full = _abs(path)
+    if os.path.isfile(full):
+        return file_sha256(full)
+    if not os.path.isdir(full):
+        return None
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(full):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(os.path.relpath(file_path, full).encode('utf-8') + b'\0')
+            digest.update(file_sha256(file_path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def command(script: str) -> List[str]:
+    """A Step script entry split into the script path and its arguments"""
+    return shlex.split(script)
+
+
+def local_modules(script: str) -> Set[str]:
+    """The script plus the sibling modules in scripts/ it imports, transitively"""
+    seen, pending = set(), [_abs(command(script)[0])]
+    while pending:
+        path = pending.pop()
+        if path in seen or not os.path.isfile(path):
+            continue
+        seen.add(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        for match in _IMPORT_RE.finditer(source):
+            module = os.path.join(SCRIPTS_DIR, (match.group(1) or match.group(2)) + '.py')
+            if os.path.isfile(module):
+                pending.append(module)
+    return {os.path.relpath(path, REPO_ROOT) for path in seen}
+
+
+def step_signature(step: Step) -> str:
+    code = sorted(set().union(*(local_modules(script) for script in step.scripts)))
+    parts = {
+        'version': PIPELINE_VERSION,
+        'scripts': step.scripts,
+        'code': {path: path_hash(path) for path in code},
+        'inputs': {path: path_hash(path) for path in step.inputs},
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _covers(output: str, path: str) -> bool:
+    return path == output or path.startswith(output.rstrip('/') + '/')
+
+
+def build_graph(steps: List[Step]) -> Dict[str, Set[str]]:
+    """step name -> names of the steps producing its inputs"""
+    producers = {}
+    for step in steps:
+        for output in step.outputs:
+            for other, claimed in producers.items():
+                if _covers(other, output) or _covers(output, other):
+                    raise ValueError(f"{step.name} and {claimed} both write {output}")
+            producers[output] = step.name
+    graph = {step.name: ({producers[output] for path in step.inputs for output in producers
+                          if _covers(output, path)} | set(step.after)) - {step.name}
+             for step in steps}
+    for step in steps:
+        unknown = set(step.after) - set(graph)
+        if unknown:
+            raise ValueError(f"{step.name} waits for unknown steps: {', '.join(sorted(unknown))}")
+
+    # Reject cycles up front rather than deadlocking the scheduler
+    visiting, done = set(), set()
+
+    def visit(name, chain):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle: {' -> '.join(chain + [name])}")
+        visiting.add(name)
+        for dependency in graph[name]:
+            visit(dependency, chain + [name])
+        visiting.discard(name)
+        done.add(name)
+
+    for name in graph:
+        visit(name, [])
+    return graph
+
+
+def with_dependencies(targets: List[str], graph: Dict[str, Set[str]]) -> Set[str]:
+    selected, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in graph:
+            raise SystemExit(f"Unknown step {name!r}; known steps: {', '.join(graph)}")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(graph[name])
+    return selected
+
+
+def load_state() -> dict:
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_state(state: dict):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with atomic_open(STATE_FILE) as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def is_up_to_date(step: Step, signature: str, state: dict) -> bool:
+    recorded = state.get(step.name)
+    if not recorded or recorded.get('signature') != signature:
+        return False
+    return all(path_hash(path) == recorded['outputs'].get(path) for path in step.outputs)
+
+
+def run_step(step: Step) -> Tuple[bool, float, str]:
+    """Run the step's scripts in order; returns (ok, seconds, log path)"""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{step.name}.log")
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        for script in step.scripts:
+            log.write(f"$ {sys.executable} {script}\n")
+            log.flush()
+            path, *args = command(script)
+            result = subprocess.run([sys.executable, _abs(path), *args], cwd=_abs(step.cwd),
+                                    stdout=log, stderr=subprocess.STDOUT)
+            if result.returncode != 0:
+                return False, time.perf_counter() - start, log_path
+    return True, time.perf_counter() - start, log_path
+
+
+def run(targets: List[str], jobs: int, force: bool = False, dry_run: bool = False) -> bool:
+    steps = {step.name: step for step in STEPS}
+    graph = build_graph(STEPS)
+    selected = with_dependencies(targets or list(steps), graph)
+    state = load_state()
+
+    pending = {name: graph[name] & selected for name in selected}
+    status: Dict[str, str] = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            # Start every step whose dependencies have finished
+            for name in sorted(name for name, deps in pending.items() if all(d in status for d in deps)):
+                deps = pending.pop(name)
+                step = steps[name]
+                if any(status[d] == 'failed' or status[d] == 'blocked' for d in deps):
+                    status[name] = 'blocked'
+                    print(f"[SKIP] {name}: a dependency failed")
+                    continue
+                if step.inputs and all(path_hash(path) is None for path in step.inputs):
+                    # e.g. merge without the JS modules would write an empty database
+                    status[name] = 'no inputs'
+                    print(f"[SKIP] {name}: none of its inputs exist")
+                    continue
+                signature = step_signature(step)
+                rebuilt_deps = any(status[d] in ('ran', 'would run') for d in deps)
+                if not force and not rebuilt_deps and is_up_to_date(step, signature, state):
+                    status[name] = 'up to date'
+                    print(f"[OK]   {name}: up to date")
+                elif dry_run:
+                    status[name] = 'would run'
+                    print(f"[RUN]  {name}: {' && '.join(step.scripts)} (dry run)")
+                else:
+                    print(f"[RUN]  {name}: {' && '.join(step.scripts)}")
+                    running[executor.submit(run_step, step)] = (name, signature)
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, signature = running.pop(future)
+                ok, seconds, log_path = future.result()
+                step = steps[name]
+                missing = [path for path in step.outputs if path_hash(path) is None]
+                if ok and not missing:
+                    status[name] = 'ran'
+                    state[name] = {'signature': signature,
+                                   'outputs': {path: path_hash(path) for path in step.outputs}}
+                    save_state(state)
+                    print(f"[DONE] {name} in {seconds:.1f}s")
+                else:
+                    status[name] = 'failed'
+                    state.pop(name, None)
+                    save_state(state)
+                    reason = f"did not write {', '.join(missing)}" if ok else "failed"
+                    print(f"[FAIL] {name} {reason} after {seconds:.1f}s, see {log_path}")
+
+    failed = sorted(name for name, result in status.items() if result in ('failed', 'blocked'))
+    if failed:
+        print(f"Failed or skipped: {', '.join(failed)}")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('targets', nargs='*', help="steps to bring up to date (default: all)")
+    parser.add_argument('-j', '--jobs', type=int,
+                        default=int(os.environ.get('AYUR_PIPELINE_JOBS') or os.cpu_count() or 1),
+                        help="steps to run at once (AYUR_PIPELINE_JOBS, default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="run the selected steps even if up to date")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would run")
+    parser.add_argument('--list', action='store_true', help="list the steps and their dependencies")
+    args = parser.parse_args()
+
+    if args.list:
+        graph = build_graph(STEPS)
+        for step in STEPS:
+            after = f" (after {', '.join(sorted(graph[step.name]))})" if graph[step.name] else ''
+            print(f"{step.name:20} {' && '.join(step.scripts)}{after}")
+        return
+    sys.exit(0 if run(args.targets, max(1, args.jobs), args.force, args.dry_run) else 1)
+
+
+if __name__ == "__main__":
+    main()
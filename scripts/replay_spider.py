@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Offline replay of the Ayurveda spider against a local corpus directory.
+
+The mirror directory holds one file per URL plus an index.json mapping each
+URL to its file (relative to the mirror), either as a plain file name or as
+{"file": ..., "encoding": ...} recording the charset the page was served
+with; without one, the encoding is detected from the page itself (BOM,
+<meta charset>, then content sniffing). Requests are served from the
+mirror instead of the network and handed straight to the spider callbacks
+(parse, parse_search_page, parse_pdf) in crawl order, so the full extraction
+pipeline runs deterministically without Scrapy's reactor. URLs missing from
+the mirror are skipped and counted.
+
+Each callback is timed, and so are the stages inside it: PDF text
+extraction, OCR and spaCy (every nlp() call and every Doc pulled from
+nlp.pipe). Nested stages are subtracted from the stage that called them, so
+the callback rows show the time left for HTML parsing and record building.
+This makes it the harness for benchmarking extraction throughput:
+
+    python replay_spider.py path/to/mirror --output /tmp/replay.json --nlp-profile lean
+"""
+
+import argparse
+import inspect
+import json
+import os
+import time
+from collections import defaultdict, deque
+from functools import partial
+
+from scrapy import Request
+from scrapy.http import HtmlResponse, Response
+
+from scrape_ayurveda import AyurvedaSpider
+
+
+class CorpusMirror:
+    """URL -> body lookup over a directory with an index.json"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, 'index.json'), 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+
+    def entry(self, url: str):
+        """(file name, recorded encoding or None) for a URL, or None if it is not mirrored"""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        if isinstance(entry, str):
+            return entry, None
+        return entry['file'], entry.get('encoding')
+
+    def get(self, url: str):
+        """Return the stored body for a URL, or None if it is not mirrored"""
+        entry = self.entry(url)
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry[0]), 'rb') as f:
+            return f.read()
+
+    def response_for(self, request: Request):
+        entry = self.entry(request.url)
+        if entry is None:
+            return None
+        name, encoding = entry
+        body = self.get(request.url)
+        if body.startswith(b'%PDF') or name.lower().endswith('.pdf'):
+            return Response(url=request.url, body=body, request=request)
+        if encoding:
+            return HtmlResponse(url=request.url, body=body, encoding=encoding, request=request)
+        return HtmlResponse(url=request.url, body=body, request=request)
+
+
+class StageTimer:
+    """Per-stage calls and self time; time in a nested stage is charged to it, not its caller"""
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.bytes = defaultdict(int)
+        self._nested = [0.0]  # time spent in nested stages, per open stage
+
+    def run(self, stage: str, fn, *args, size: int = 0):
+        self._nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+            # Generator callbacks do their work while being consumed
+            return list(result) if inspect.isgenerator(result) else result
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._nested.pop()
+            self._nested[-1] += elapsed
+            self.calls[stage] += 1
+            self.seconds[stage] += elapsed - nested
+            self.bytes[stage] += size
+
+    def wrap(self, stage: str, fn):
+        """fn with every call timed as stage"""
+        return lambda *args, **kwargs: self.run(stage, partial(fn, **kwargs), *args)
+
+    def iterate(self, stage: str, iterable):
+        """Time each item pulled from iterable as stage, e.g. the Docs of a lazy nlp.pipe"""
+        iterator = iter(iterable)
+        sentinel = object()
+        while True:
+            item = self.run(stage, next, iterator, sentinel)
+            if item is sentinel:
+                return
+            yield item
+
+    def report(self):
+        lines = [f"{'stage':20} {'calls':>7} {'seconds':>9} {'ms/call':>9} {'MB/s':>8}"]
+        for stage in self.calls:
+            calls, seconds = self.calls[stage], self.seconds[stage]
+            mb_per_sec = self.bytes[stage] / 1e6 / seconds if seconds and self.bytes[stage] else 0
+            lines.append(f"{stage:20} {calls:7d} {seconds:9.3f} {seconds / calls * 1000:9.1f} {mb_per_sec:8.2f}")
+        return '\n'.join(lines)
+
+
+class TimedPipeline:
+    """spaCy pipeline proxy charging nlp() calls and pipe() output to the 'nlp' stage"""
+
+    def __init__(self, nlp, timer: StageTimer):
+        self._nlp = nlp
+        self._timer = timer
+
+    def __call__(self, text, **kwargs):
+        return self._timer.run('nlp', partial(self._nlp, **kwargs), text)
+
+    def pipe(self, texts, **kwargs):
+        return self._timer.iterate('nlp', self._nlp.pipe(texts, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._nlp, name)
+
+
+def instrument(spider: AyurvedaSpider, timer: StageTimer):
+    """Break PDF text extraction, OCR and spaCy out of the callback timings"""
+    spider.nlp = TimedPipeline(spider.nlp, timer)
+    spider.pdf_text = timer.wrap('pdf_text', spider.pdf_text)
+    spider.ocr_pdf = timer.wrap('ocr', spider.ocr_pdf)
+
+
+def replay(spider: AyurvedaSpider, mirror: CorpusMirror, timer: StageTimer):
+    """Run the crawl breadth-first over the mirror; returns (responses, missing URLs)"""
+    queue = deque(timer.run('start_requests', spider.start_requests))
+    seen = set()
+    responses, missing = 0, []
+    while queue:
+        request = queue.popleft()
+        if request.url in seen:
+            continue
+        seen.add(request.url)
+        response = mirror.response_for(request)
+        if response is None:
+            missing.append(request.url)
+            continue
+        responses += 1
+        callback = request.callback or spider.parse
+        try:
+            results = timer.run(callback.__name__, callback, response, size=len(response.body))
+        except Exception as e:
+            spider.logger.error(f"{callback.__name__} failed on {request.url}: {e}")
+            continue
+        queue.extend(r for r in results or [] if isinstance(r, Request))
+    timer.run('closed', spider.closed, 'finished')
+    return responses, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('mirror', help="directory with index.json and the mirrored bodies")
+    parser.add_argument('--output', default=os.path.join(os.path.abspath('.'), 'replay_diseases.json'),
+                        help="where to write the extracted diseases (never the backend database)")
+    parser.add_argument('--nlp-profile', default=None, help="spaCy profile: full or lean")
+    args = parser.parse_args()
+
+    timer = StageTimer()
+    spider = timer.run('init', partial(AyurvedaSpider, nlp_profile=args.nlp_profile, output_json=args.output))
+    instrument(spider, timer)
+    start = time.perf_counter()
+    responses, missing = replay(spider, CorpusMirror(args.mirror), timer)
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {responses} responses in {elapsed:.2f}s ({responses / elapsed if elapsed else 0:.1f} responses/sec), "
+          f"{len(missing)} URLs not in the mirror, {spider.disease_count} diseases -> {args.output}")
+    print(timer.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Transliteration-insensitive keys for disease names, and an index over them.
+
+The same Sanskrit name turns up as Devanagari (ज्वर), IAST (Jvara) and
+ad-hoc ASCII (Jwara, Jwar), so names are reduced to one key: Devanagari is
+transliterated, diacritics, case, spacing and punctuation are dropped (as in
+disease_dedup.normalize_name), and the common ASCII spellings are folded
+onto the IAST ones (sh -> s, ch -> c, w -> v, ee -> i, doubled letters, a
+trailing schwa). Keys are only for matching; they are not meant to be shown.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from disease_dedup import normalize_name
+
+_VOWELS = {
+    'अ': 'a', 'आ': 'ā', 'इ': 'i', 'ई': 'ī', 'उ': 'u', 'ऊ': 'ū', 'ऋ': 'ṛ', 'ॠ': 'ṝ',
+    'ऌ': 'ḷ', 'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au',
+}
+_MATRAS = {
+    'ा': 'ā', 'ि': 'i', 'ी': 'ī', 'ु': 'u', 'ू': 'ū', 'ृ': 'ṛ', 'ॄ': 'ṝ', 'ॢ': 'ḷ',
+    'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+}
+_CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'ṅ',
+    'च': 'c', 'छ': 'ch', 'ज': 'j', 'झ': 'jh', 'ञ': 'ñ',
+    'ट': 'ṭ', 'ठ': 'ṭh', 'ड': 'ḍ', 'ढ': 'ḍh', 'ण': 'ṇ',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'ळ': 'ḷ', 'व': 'v',
+    'श': 'ś', 'ष': 'ṣ', 'स': 's', 'ह': 'h',
+}
+_SIGNS = {'ं': 'ṃ', 'ँ': 'm̐', 'ः': 'ḥ', 'ऽ': ''}
+_VIRAMA = '्'
+_NUKTA = '़'
+
+# Applied in order to the ASCII form
+_ASCII_FOLDS = (
+    ('chh', 'c'), ('ch', 'c'), ('sh', 's'), ('w', 'v'), ('ee', 'i'), ('oo', 'u'), ('ri', 'r'),
+)
+_DOUBLED_RE = re.compile(r'(.)\1+')
+
+
+def transliterate_devanagari(text: str) -> str:
+    """Devanagari to IAST; other characters pass through unchanged"""
+    out = []
+    pending_a = False
+    for ch in text:
+        if ch == _NUKTA:
+            continue
+        if ch in _MATRAS or ch == _VIRAMA:
+            # Replaces the consonant's inherent vowel
+            pending_a = False
+            out.append(_MATRAS.get(ch, ''))
+            continue
+        if pending_a:
+            out.append('a')
+            pending_a = False
+        if ch in _CONSONANTS:
+            out.append(_CONSONANTS[ch])
+            pending_a = True
+        else:
+            out.append(_VOWELS.get(ch) or _SIGNS.get(ch, ch))
+    if pending_a:
+        out.append('a')
+    return ''.join(out)
+
+
+@lru_cache(maxsize=65536)
+def _key(name: str) -> str:
+    key = normalize_name(transliterate_devanagari(name))
+    for spelling, folded in _ASCII_FOLDS:
+        key = key.replace(spelling, folded)
+    key = _DOUBLED_RE.sub(r'\1', key)
+    return key[:-1] if len(key) > 2 and key.endswith('a') else key
+
+
+def name_key(name: Any) -> str:
+    """Matching key for a disease name in any script or spelling ('' if none)"""
+    if not isinstance(name, str) or not name:
+        return ''
+    return _key(name)
+
+
+class NameIndex:
+    """
+    First-occurrence index of records by the name keys of the given fields.
+    find() returns the earliest record matching on any field, which is what
+    a linear scan over the records would return.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]], fields: Sequence[str] = ('name', 'sanskrit')):
+        self.records: List[Dict[str, Any]] = list(records)
+        self.positions: Dict[str, Dict[str, int]] = {field: {} for field in fields}
+        for position, record in enumerate(self.records):
+            for field, index in self.positions.items():
+                key = name_key(record.get(field))
+                if key:
+                    index.setdefault(key, position)
+
+    def position(self, record: Dict[str, Any]) -> Optional[int]:
+        hits = [index[key] for field, index in self.positions.items()
+                for key in (name_key(record.get(field)),) if key in index]
+        return min(hits) if hits else None
+
+    def find(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        position = self.position(record)
+        return None if position is None else self.records[position]
@@ -1,22 +1,137 @@
 import scrapy
 import PyPDF2
-import pytesseract
 from bs4 import BeautifulSoup
-import spacy
 import json
-import re
 import requests
-from urllib.parse import urljoin
-from io import BytesIO
+from urllib.parse import urljoin, urlparse
+from datetime import datetime
+from itertools import chain, islice
 import logging
-from pdf2image import convert_from_bytes
 import os
 
+from data_files import atomic_open
+from disease_dedup import dedupe_diseases
+from http_cache import http_cache_settings
+from ingredient_matcher import IngredientMatcher
+from nlp_models import blank, missing_model_hint, new_model
+from pdf_extraction import spool_pdf
+from pdf_ocr import ocr_pages
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Always write to backend/data/disease_database.json for backend compatibility
+OUTPUT_JSON = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend', 'data', 'disease_database.json')
+# Append-only log of extracted records; OUTPUT_JSON is compacted from it
+OUTPUT_JSONL = os.path.splitext(OUTPUT_JSON)[0] + '.jsonl'
+# Number of save_data() calls between compactions of the log into OUTPUT_JSON
+COMPACT_EVERY = 25
+
+
+def compact_database(jsonl_path=OUTPUT_JSONL, json_path=OUTPUT_JSON):
+    """
+    Rewrite json_path from the records in the JSON Lines log, atomically, so
+    readers never see a half-written file. Also recovers the JSON after a crash.
+    Near-duplicate diseases from different sources are merged on the way
+    (see disease_dedup.py); the log itself keeps every raw record. Lines that
+    do not decode (a record torn by a crash mid-append) are logged and skipped.
+    """
+    raw_records = []
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                raw_records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logging.warning(f"Skipping undecodable line {line_number} of {jsonl_path}: {str(e)}")
+    records = dedupe_diseases(raw_records)
+    if len(records) < len(raw_records):
+        logging.info(f"Merged {len(raw_records) - len(records)} duplicate diseases")
+    with atomic_open(json_path) as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    return len(records)
+
+# Scheduling: slow PDF hosts get fewer slots than quick HTML sites, AutoThrottle
+# adapts delays to each host's latency, and the scraper stops pulling new
+# responses while this many bytes are still being processed
+CRAWL_SETTINGS = {
+    'CONCURRENT_REQUESTS': 16,
+    'CONCURRENT_REQUESTS_PER_DOMAIN': 4,
+    # Keyed by the slot names download_slot() assigns. Only concurrency is
+    # set: AutoThrottle replaces a slot's delay after its first response
+    'DOWNLOAD_SLOTS': {
+        'archive.org': {'concurrency': 2},
+        'www.ccras.nic.in': {'concurrency': 1},
+        'www.iamj.in': {'concurrency': 1},
+        'www.wisdomlib.org': {'concurrency': 4},
+    },
+    'AUTOTHROTTLE_ENABLED': True,
+    'AUTOTHROTTLE_START_DELAY': 0.5,
+    'AUTOTHROTTLE_MAX_DELAY': 30,
+    'AUTOTHROTTLE_TARGET_CONCURRENCY': 2.0,
+    'SCRAPER_SLOT_MAX_ACTIVE_SIZE': 50_000_000,
+    'DOWNLOAD_WARNSIZE': 64 * 1024 * 1024,
+}
+
+# HTML pages are scheduled ahead of multi-MB PDFs
+HTML_PRIORITY = 10
+PDF_PRIORITY = -10
+
+# Hosts whose mirrors share one download slot, e.g. archive.org downloads
+# served from ia800000.us.archive.org
+SHARED_SLOT_DOMAINS = ('archive.org',)
+
+
+def request_priority(url):
+    return PDF_PRIORITY if url.lower().split('?')[0].endswith('.pdf') else HTML_PRIORITY
+
+
+def download_slot(url):
+    """The download slot for url: its hostname, or the shared domain it belongs to"""
+    host = urlparse(url).hostname or ''
+    for domain in SHARED_SLOT_DOMAINS:
+        if host == domain or host.endswith('.' + domain):
+            return domain
+    return host
+
+
+def crawl_request(url, callback, meta=None, **kwargs):
+    """
+    A prioritised request pinned to its download slot. The slot is kept in
+    meta, so it survives redirects to other hosts of the same site.
+    """
+    meta = {**(meta or {}), 'download_slot': download_slot(url)}
+    return scrapy.Request(url, callback=callback, meta=meta, priority=request_priority(url), **kwargs)
+
+# Long texts are fed to spaCy in chunks of at most this many characters
+NLP_CHUNK_CHARS = 30000
+
+
+def iter_text_chunks(text, max_chars=NLP_CHUNK_CHARS):
+    """
+    Split text into chunks of at most max_chars, cutting at the last paragraph
+    break, line break, sentence end or space in the second half of each window
+    (in that order of preference) so sentences are not split mid-way.
+    """
+    start = 0
+    while len(text) - start > max_chars:
+        window_end = start + max_chars
+        cut = window_end
+        for separator in ('\n\n', '\n', '. ', ' '):
+            idx = text.rfind(separator, start + max_chars // 2, window_end)
+            if idx != -1:
+                cut = idx + len(separator)
+                break
+        yield text[start:cut]
+        start = cut
+    if start < len(text):
+        yield text[start:]
+
 class AyurvedaSpider(scrapy.Spider):
     name = 'ayurveda_scraper'
+    # Re-crawls revalidate cached responses instead of downloading everything again
+    custom_settings = {**CRAWL_SETTINGS, **http_cache_settings()}
     allowed_domains = [
         'archive.org', 'rkamc.org.in', 'sanskritdocuments.org', 'tbrc.org',
         'accesstoinsight.org', 'ccras.nic.in', 'iamj.in', 'easyayurveda.com',
@@ -139,35 +254,87 @@ class AyurvedaSpider(scrapy.Spider):
     lifestyle_keywords = ['lifestyle', 'vihara', 'routine', 'exercise', 'yoga']
     precaution_keywords = ['precaution', 'avoid', 'apathy', 'contraindication']
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, nlp_profile=None, nlp_processes=None, output_json=None, **kwargs):
         super().__init__(*args, **kwargs)
+        # -a output_json=... writes somewhere other than the backend database
+        self.output_json = output_json or OUTPUT_JSON
+        self.output_jsonl = os.path.splitext(self.output_json)[0] + '.jsonl'
+        # Spider arguments (-a nlp_profile=lean -a nlp_processes=4) override the environment
+        self.nlp_profile = nlp_profile or os.environ.get('AYUR_SPACY_PROFILE', 'full')
+        self.nlp_processes = int(nlp_processes or os.environ.get('AYUR_SPACY_PROCESSES') or 1)
         try:
-            self.nlp = spacy.load('en_core_web_sm')
-            # Add custom pipeline for Ayurvedic terms
-            if not self.nlp.has_pipe('entity_ruler'):
-                ruler = self.nlp.add_pipe('entity_ruler')
-            else:
-                ruler = self.nlp.get_pipe('entity_ruler')
-            patterns = [
-                {'label': 'DISEASE', 'pattern': pattern}
-                for pattern in self.modern_correlations.keys()
-            ] + [
-                {'label': 'SYMPTOM', 'pattern': pattern}
-                for pattern in self.symptom_keywords
-            ] + [
-                {'label': 'HERB', 'pattern': pattern}
-                for pattern in self.herb_keywords
-            ] + [
-                {'label': 'TOXIC', 'pattern': pattern}
-                for pattern in self.toxic_ingredients
-            ]
-            ruler.add_patterns(patterns)
+            self.nlp = self.build_nlp(self.nlp_profile)
         except OSError:
-            logging.error("spaCy model 'en_core_web_sm' not found. Install it with: python -m spacy download en_core_web_sm")
+            logging.error(missing_model_hint())
             raise
+        self.ingredient_matcher = IngredientMatcher(self.herb_keywords, self.toxic_ingredients)
         self.diseases = []
         self.disease_count = 0
         self.sample_datasets = self.load_sample_datasets()
+        # Records already appended to the log, and saves since the last compaction
+        self.saved_count = 0
+        self.saves_since_compaction = 0
+        # closed() removes the log, so a leftover one means the previous crawl
+        # died before compacting; keep its records in the JSON, then start this
+        # crawl with a fresh log
+        if os.path.exists(self.output_jsonl) and os.path.getsize(self.output_jsonl):
+            self.recover_log()
+        open(self.output_jsonl, 'w', encoding='utf-8').close()
+
+    def recover_log(self):
+        try:
+            count = compact_database(self.output_jsonl, self.output_json)
+            logging.info(f"Recovered {count} diseases from {self.output_jsonl}")
+        except Exception as e:
+            # Keep the log aside for inspection rather than refusing to crawl
+            failed_path = f"{self.output_jsonl}.failed"
+            os.replace(self.output_jsonl, failed_path)
+            logging.error(f"Error recovering {self.output_jsonl}, moved to {failed_path}: {str(e)}")
+
+    @classmethod
+    def ruler_patterns(cls):
+        return [
+            {'label': 'DISEASE', 'pattern': pattern}
+            for pattern in cls.modern_correlations.keys()
+        ] + [
+            {'label': 'SYMPTOM', 'pattern': pattern}
+            for pattern in cls.symptom_keywords
+        ] + [
+            {'label': 'HERB', 'pattern': pattern}
+            for pattern in cls.herb_keywords
+        ] + [
+            {'label': 'TOXIC', 'pattern': pattern}
+            for pattern in cls.toxic_ingredients
+        ]
+
+    @classmethod
+    def build_nlp(cls, profile='full'):
+        """
+        'full' is en_core_web_sm (tagger, parser, NER) plus the entity ruler.
+        'lean' is a blank English pipeline with only a sentencizer and the
+        ruler, which covers the sentence boundaries and ruler entities the
+        spider reads, without loading or running the statistical components.
+        """
+        if profile == 'full':
+            # The spider's own copy: the ruler patterns must not leak into the
+            # shared load_model() pipeline other code in the process reads
+            nlp = new_model()
+        elif profile == 'lean':
+            nlp = blank('en')
+            nlp.add_pipe('sentencizer')
+        else:
+            raise ValueError(f"Unknown spaCy profile: {profile}")
+        # Add custom pipeline for Ayurvedic terms
+        if not nlp.has_pipe('entity_ruler'):
+            ruler = nlp.add_pipe('entity_ruler')
+        else:
+            ruler = nlp.get_pipe('entity_ruler')
+        ruler.add_patterns(cls.ruler_patterns())
+        return nlp
+
+    def pipe(self, texts):
+        """Run the pipeline over a batch of texts, across nlp_processes workers"""
+        return self.nlp.pipe(texts, n_process=self.nlp_processes, batch_size=64)
 
     def load_sample_datasets(self):
         # Expanded sample dataset for instant testing (15 diseases)
@@ -433,9 +600,9 @@ class AyurvedaSpider(scrapy.Spider):
         self.diseases.extend(self.sample_datasets)
         self.disease_count += len(self.sample_datasets)
         for url in self.start_urls:
-            yield scrapy.Request(url, callback=self.parse, errback=self.handle_error)
+            yield crawl_request(url, self.parse, errback=self.handle_error)
         for name, url in self.custom_urls.items():
-            yield scrapy.Request(url, callback=self.parse_search_page, meta={'text_name': name})
+            yield crawl_request(url, self.parse_search_page, meta={'text_name': name})
 
     def parse_search_page(self, response):
         text_name = response.meta['text_name']
@@ -444,24 +611,29 @@ class AyurvedaSpider(scrapy.Spider):
             pdf_url = urljoin(response.url, link['href'])
             if not pdf_url.startswith('http'):
                 pdf_url = f"https://{self.allowed_domains[0]}{pdf_url}"
-            yield scrapy.Request(pdf_url, callback=self.parse_pdf, meta={'text_name': text_name})
+            yield crawl_request(pdf_url, self.parse_pdf, meta={'text_name': text_name})
 
     def parse(self, response):
         soup = BeautifulSoup(response.text, 'html.parser')
         source = response.url
         if any(domain in source for domain in ['easyayurveda.com', 'wisdomlib.org', 'amitaayurveda.com', 'planetayurveda.com', 'chandigarhayurvedcentre.com']):
-            for section in soup.select('h2, h3, h4'):
-                header = section.text.strip()
-                if any(keyword in header.lower() for keyword in ['vata', 'pitta', 'kapha', 'vyadhi', 'nidana', 'chikitsa', 'disease', 'roga', 'samprapti']):
-                    disease_data = self.parse_section(section, source)
-                    if disease_data:
-                        self.diseases.append(disease_data)
-                        self.disease_count += 1
-                        logging.info(f"Extracted disease {self.disease_count}: {disease_data['diseaseId']}")
+            sections = [section for section in soup.select('h2, h3, h4')
+                        if any(keyword in section.text.strip().lower() for keyword in ['vata', 'pitta', 'kapha', 'vyadhi', 'nidana', 'chikitsa', 'disease', 'roga', 'samprapti'])]
+            # Section headers are queued and run through the pipeline in one batch
+            header_docs = self.pipe([self.section_heading_text(section) for section in sections])
+            for section, doc in zip(sections, header_docs):
+                disease_data = self.parse_section(section, source, doc)
+                if disease_data:
+                    self.diseases.append(disease_data)
+                    self.disease_count += 1
+                    logging.info(f"Extracted disease {self.disease_count}: {disease_data['diseaseId']}")
         elif any(domain in source for domain in ['sanskritdocuments.org', 'accesstoinsight.org', 'niimh.nic.in']):
-            for section in soup.select('p, div.content, div.text'):
-                text = section.text.strip()
-                disease_data = self.parse_text(text, source)
+            texts = [section.text.strip() for section in soup.select('p, div.content, div.text')]
+            # All chunks of all blocks go through one pipe; each block takes its share in order
+            chunks = [list(iter_text_chunks(text)) for text in texts]
+            docs = self.pipe(chain.from_iterable(chunks))
+            for text, text_chunks in zip(texts, chunks):
+                disease_data = self.parse_text(text, source, islice(docs, len(text_chunks)))
                 if disease_data:
                     if isinstance(disease_data, list):
                         self.diseases.extend(disease_data)
@@ -477,16 +649,7 @@ class AyurvedaSpider(scrapy.Spider):
     def parse_pdf(self, response):
         text_name = response.meta['text_name']
         try:
-            pdf_file = BytesIO(response.body)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ''
-            for page in pdf_reader.pages:
-                extracted_text = page.extract_text()
-                if extracted_text:
-                    text += extracted_text + '\n'
-                else:
-                    logging.warning(f"Text extraction failed for page in {text_name}. Attempting OCR.")
-                    text += self.ocr_pdf(pdf_file)
+            text = self.pdf_text(response.body, text_name)
             disease_data = self.parse_text(text, text_name)
             if disease_data:
                 if isinstance(disease_data, list):
@@ -502,20 +665,43 @@ class AyurvedaSpider(scrapy.Spider):
             logging.error(f"Error processing PDF {text_name}: {str(e)}")
         self.save_data()
 
-    def ocr_pdf(self, pdf_file):
+    def pdf_text(self, body, text_name):
+        """Text of a downloaded PDF, OCR'ing the pages PyPDF2 gets no text from"""
+        # Parse from a memory-mapped spool file; OCR workers read the same file
+        with spool_pdf(body) as (pdf_path, pdf_map):
+            pdf_reader = PyPDF2.PdfReader(pdf_map)
+            page_texts = []
+            failed_pages = []
+            for page_number, page in enumerate(pdf_reader.pages):
+                extracted_text = page.extract_text()
+                if extracted_text:
+                    page_texts.append(extracted_text + '\n')
+                else:
+                    page_texts.append('')
+                    failed_pages.append(page_number)
+            if failed_pages:
+                logging.warning(f"Text extraction failed for {len(failed_pages)} pages in {text_name}. Attempting OCR.")
+                ocr_texts = self.ocr_pdf(pdf_path, failed_pages)
+                for page_number in failed_pages:
+                    page_texts[page_number] = ocr_texts.get(page_number, '') + '\n'
+        return ''.join(page_texts)
+
+    def ocr_pdf(self, pdf_path, page_numbers):
+        """OCR only the given pages, in parallel and through the page cache (see pdf_ocr.py)"""
         try:
-            images = convert_from_bytes(pdf_file.read())
-            text = ''
-            for image in images:
-                text += pytesseract.image_to_string(image) + '\n'
-            return text
+            return ocr_pages(pdf_path, page_numbers)
         except Exception as e:
             logging.error(f"OCR failed: {str(e)}")
-            return ''
+            return {}
+
+    @staticmethod
+    def section_heading_text(section):
+        return section.text.strip() + ' ' + (section.next_sibling.text if section.next_sibling else '')
 
-    def parse_section(self, section, source):
+    def parse_section(self, section, source, doc=None):
         header = section.text.strip()
-        doc = self.nlp(header + ' ' + (section.next_sibling.text if section.next_sibling else ''))
+        if doc is None:
+            doc = self.nlp(self.section_heading_text(section))
         disease_name = None
         for ent in doc.ents:
             if ent.label_ == 'DISEASE' or any(keyword in ent.text.lower() for keyword in self.modern_correlations.keys()):
@@ -530,38 +716,68 @@ class AyurvedaSpider(scrapy.Spider):
         lifestyle = []
         precautions = []
         text = ''
-        for sibling in section.next_siblings:
-            if sibling.name in ['ul', 'p', 'div'] and hasattr(sibling, 'text'):
-                text += sibling.text.strip() + ' '
-                doc_sibling = self.nlp(text)
-                # Extract symptoms
-                if any(s in text.lower() for s in self.symptom_keywords + ['lakshana', 'sign']):
-                    symptoms.extend([ent.text for ent in doc_sibling.ents if ent.label_ == 'SYMPTOM' or any(s in ent.text.lower() for s in self.symptom_keywords)])
-                # Extract treatments
-                if any(t in text.lower() for t in self.treatment_keywords):
-                    ingredients = re.findall(r'\b(' + '|'.join(self.herb_keywords + self.toxic_ingredients) + r')\b', text, re.I)
-                    warning = 'Warning: Contains heavy metals, consult practitioner for safety' if any(i in ingredients for i in self.toxic_ingredients) else ''
-                    treatments.append({
-                        'type': 'Herbal' if any(i in self.herb_keywords for i in ingredients) else 'Therapy',
-                        'description': text[:200] + '...' if len(text) > 200 else text,
-                        'ingredients': ingredients or ['Not specified'],
-                        'source': source
-                    })
-                    herbs.extend([i for i in ingredients if i in self.herb_keywords])
-                    if warning:
-                        precautions.append(warning)
-                # Extract diet
-                if any(d in text.lower() for d in self.diet_keywords):
-                    diet.extend(['Barley', 'Bitter gourd', 'Millets'] if 'pitta' in text.lower() else ['Mung dal', 'Pomegranate'] if 'kapha' in text.lower() else ['Not specified'])
-                # Extract lifestyle
-                if any(l in text.lower() for l in self.lifestyle_keywords):
-                    lifestyle.extend(['Daily yoga', 'Meditation', 'Pranayama'] if 'kapha' in text.lower() else ['Warm baths', 'Stress management'] if 'vata' in text.lower() else ['Not specified'])
-                # Extract precautions
-                if any(p in text.lower() for p in self.precaution_keywords):
-                    precautions.extend(['Avoid cold foods', 'Avoid stress'] if 'vata' in text.lower() else ['Avoid spicy foods'] if 'pitta' in text.lower() else ['Not specified'])
-                # Extract pathogenesis
-                if any(p in text.lower() for p in ['pathogenesis', 'samprapti', 'cause', 'etiology']):
-                    pathogenesis = text[:200] + '...' if len(text) > 200 else text
+        chunks = [sibling.text.strip() for sibling in section.next_siblings
+                  if sibling.name in ['ul', 'p', 'div'] and hasattr(sibling, 'text')]
+        # The keyword checks below only ever turn true as the section grows, so
+        # each chunk is lowercased and matched once and the results carried
+        # forward, instead of re-scanning the accumulated text per sibling
+        keyword_groups = {
+            'symptoms': self.symptom_keywords + ['lakshana', 'sign'],
+            'treatments': self.treatment_keywords,
+            'diet': self.diet_keywords,
+            'lifestyle': self.lifestyle_keywords,
+            'precautions': self.precaution_keywords,
+            'pathogenesis': ['pathogenesis', 'samprapti', 'cause', 'etiology'],
+            'vata': ['vata'],
+            'pitta': ['pitta'],
+            'kapha': ['kapha'],
+        }
+        seen = set()
+        ingredients = []
+        section_herbs = []
+        toxic = False
+        # Each chunk goes through the pipeline once; entities are carried over
+        # instead of re-running spaCy on the whole accumulated text per sibling
+        section_symptoms = []
+        for chunk, doc_chunk in zip(chunks, self.nlp.pipe(chunks)):
+            text += chunk + ' '
+            chunk_lower = chunk.lower()
+            seen.update(group for group, keywords in keyword_groups.items()
+                        if group not in seen and any(k in chunk_lower for k in keywords))
+            hits = self.ingredient_matcher.match(chunk)
+            ingredients.extend(hits.ingredients)
+            section_herbs.extend(hits.herbs)
+            toxic = toxic or bool(hits.toxic)
+            section_symptoms.extend([ent.text for ent in doc_chunk.ents if ent.label_ == 'SYMPTOM' or any(s in ent.text.lower() for s in self.symptom_keywords)])
+            # Extract symptoms
+            if 'symptoms' in seen:
+                symptoms.extend(section_symptoms)
+                section_symptoms = []
+            # Extract treatments
+            if 'treatments' in seen:
+                warning = 'Warning: Contains heavy metals, consult practitioner for safety' if toxic else ''
+                treatments.append({
+                    'type': 'Herbal' if section_herbs else 'Therapy',
+                    'description': text[:200] + '...' if len(text) > 200 else text,
+                    'ingredients': list(ingredients) or ['Not specified'],
+                    'source': source
+                })
+                # Every treatment so far covers the whole section's herbs
+                herbs = section_herbs
+                if warning:
+                    precautions.append(warning)
+            # Extract diet
+            if 'diet' in seen:
+                diet.extend(['Barley', 'Bitter gourd', 'Millets'] if 'pitta' in seen else ['Mung dal', 'Pomegranate'] if 'kapha' in seen else ['Not specified'])
+            # Extract lifestyle
+            if 'lifestyle' in seen:
+                lifestyle.extend(['Daily yoga', 'Meditation', 'Pranayama'] if 'kapha' in seen else ['Warm baths', 'Stress management'] if 'vata' in seen else ['Not specified'])
+            # Extract precautions
+            if 'precautions' in seen:
+                precautions.extend(['Avoid cold foods', 'Avoid stress'] if 'vata' in seen else ['Avoid spicy foods'] if 'pitta' in seen else ['Not specified'])
+            # Extract pathogenesis
+            if 'pathogenesis' in seen:
+                pathogenesis = text[:200] + '...' if len(text) > 200 else text
         return {
             'diseaseId': f"{source.split('/')[-1]}_{self.disease_count + 1}",
             'name': disease_name or 'Unknown',
@@ -578,11 +794,14 @@ class AyurvedaSpider(scrapy.Spider):
             'modernEquivalent': self.modern_correlations.get(disease_name, 'Not specified')
         }
 
-    def parse_text(self, text, source):
-        doc = self.nlp(text[:30000])  # Increased limit for better coverage
+    def parse_text(self, text, source, docs=None):
+        # The whole text is mined chunk by chunk; current_disease carries over
+        # chunk boundaries, and only one chunk's Doc is alive at a time
+        if docs is None:
+            docs = self.nlp.pipe(iter_text_chunks(text))
         disease_data = []
         current_disease = None
-        for sent in doc.sents:
+        for sent in (sent for doc in docs for sent in doc.sents):
             if any(keyword in sent.text.lower() for keyword in ['disease', 'vyadhi', 'nidana', 'roga', 'samprapti'] + list(self.modern_correlations.keys())):
                 current_disease = {
                     'diseaseId': f"{source.split('/')[-1]}_{self.disease_count + 1}",
@@ -604,15 +823,16 @@ class AyurvedaSpider(scrapy.Spider):
                 if any(s in sent.text.lower() for s in self.symptom_keywords + ['lakshana', 'sign']):
                     current_disease['symptoms'].extend([ent.text for ent in sent.ents if ent.label_ == 'SYMPTOM' or any(s in ent.text.lower() for s in self.symptom_keywords)])
                 if any(t in sent.text.lower() for t in self.treatment_keywords):
-                    ingredients = re.findall(r'\b(' + '|'.join(self.herb_keywords + self.toxic_ingredients) + r')\b', sent.text, re.I)
-                    warning = 'Warning: Contains heavy metals, consult practitioner for safety' if any(i in ingredients for i in self.toxic_ingredients) else ''
+                    hits = self.ingredient_matcher.match(sent.text)
+                    ingredients = hits.ingredients
+                    warning = 'Warning: Contains heavy metals, consult practitioner for safety' if hits.toxic else ''
                     current_disease['treatments'].append({
-                        'type': 'Herbal' if any(i in self.herb_keywords for i in ingredients) else 'Therapy',
+                        'type': 'Herbal' if hits.herbs else 'Therapy',
                         'description': sent.text[:200] + '...' if len(sent.text) > 200 else sent.text,
                         'ingredients': ingredients or ['Not specified'],
                         'source': source
                     })
-                    current_disease['herbs'].extend([i for i in ingredients if i in self.herb_keywords])
+                    current_disease['herbs'].extend(hits.herbs)
                     if warning:
                         current_disease['precautions'].append(warning)
                 if any(d in sent.text.lower() for d in self.diet_keywords):
@@ -632,15 +852,60 @@ class AyurvedaSpider(scrapy.Spider):
                 doshas.append(dosha)
         return doshas or ['Not specified']
 
-    def save_data(self):
+    def save_data(self, periodic_compaction=True):
+        """Append the records extracted since the last save; compact every COMPACT_EVERY saves"""
         try:
-            # Always write to backend/data/disease_database.json for backend compatibility
-            output_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend', 'data', 'disease_database.json')
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(self.diseases, f, indent=2, ensure_ascii=False)
-            logging.info(f"Saved {self.disease_count} diseases to {output_path}")
+            new_records = self.diseases[self.saved_count:]
+            if new_records:
+                with open(self.output_jsonl, 'a', encoding='utf-8') as f:
+                    for record in new_records:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.saved_count += len(new_records)
+                logging.info(f"Appended {len(new_records)} diseases to {self.output_jsonl} ({self.saved_count} total)")
+            self.saves_since_compaction += 1
+            if periodic_compaction and self.saves_since_compaction >= COMPACT_EVERY:
+                self.compact_data()
         except Exception as e:
             logging.error(f"Error saving data: {str(e)}")
 
+    def compact_data(self):
+        try:
+            count = compact_database(self.output_jsonl, self.output_json)
+            self.saves_since_compaction = 0
+            logging.info(f"Saved {count} diseases to {self.output_json}")
+            return True
+        except Exception as e:
+            logging.error(f"Error compacting data: {str(e)}")
+            return False
+
+    def closed(self, reason):
+        # Flush anything not yet appended and leave a complete JSON behind, compacting once
+        self.save_data(periodic_compaction=False)
+        if self.compact_data():
+            # Everything is in the JSON now; a log left on disk only ever means a crash
+            os.remove(self.output_jsonl)
+        self.record_throughput()
+
+    def record_throughput(self):
+        """Add crawl throughput (pages/min, bytes/s) to the crawl stats"""
+        crawler = getattr(self, 'crawler', None)
+        if crawler is None or crawler.stats is None:
+            return
+        stats = crawler.stats
+        start_time = stats.get_value('start_time')
+        if start_time is None:
+            return
+        elapsed = (datetime.now(start_time.tzinfo) - start_time).total_seconds()
+        if elapsed <= 0:
+            return
+        pages = stats.get_value('response_received_count', 0)
+        response_bytes = stats.get_value('downloader/response_bytes', 0)
+        stats.set_value('ayur/pages_per_min', round(pages / elapsed * 60, 2))
+        stats.set_value('ayur/bytes_per_sec', round(response_bytes / elapsed))
+        logging.info(f"Crawled {pages} pages in {elapsed:.0f}s: "
+                     f"{pages / elapsed * 60:.1f} pages/min, {response_bytes / elapsed / 1024:.1f} KiB/s")
+
     def handle_error(self, failure):
         logging.error(f"Request failed: {failure.request.url}") 
\ No newline at end of file
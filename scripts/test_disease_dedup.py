@@ -0,0 +1,43 @@
+"""Tests for near-duplicate merging of crawled diseases (run with pytest from scripts/)"""
+
+from disease_dedup import dedupe_diseases, record_key
+
+
+def disease(name, symptoms=(), sanskrit='', source='a'):
+    return {'name': name, 'sanskrit': sanskrit, 'symptoms': list(symptoms), 'treatments': [], 'source': source}
+
+
+FEVER_SYMPTOMS = [f"{kind} {part}" for kind in ('burning', 'aching', 'dull', 'sharp', 'throbbing')
+                  for part in ('head', 'joints', 'back', 'eyes', 'limbs', 'chest', 'stomach', 'throat')]
+
+
+def test_near_duplicates_with_the_same_name_are_merged():
+    records = [
+        disease('Jvara', FEVER_SYMPTOMS),
+        disease('jvara', FEVER_SYMPTOMS + ['sweating'], source='b'),
+    ]
+    merged = dedupe_diseases(records)
+    assert len(merged) == 1
+    assert 'sweating' in merged[0]['symptoms']
+
+
+def test_different_names_are_kept_apart():
+    symptoms = ['high fever', 'body ache']
+    assert len(dedupe_diseases([disease('Jvara', symptoms), disease('Kasa', symptoms)])) == 2
+
+
+def test_records_without_a_name_are_never_merged():
+    records = [
+        disease('Unknown'),
+        disease('Unknown', sanskrit='Unknown'),
+        {'symptoms': [], 'treatments': []},
+        disease('Not specified', ['cough', 'fever']),
+        disease('Unknown', ['cough', 'fever']),
+    ]
+    assert [record_key(record) for record in records] == [''] * len(records)
+    assert dedupe_diseases(records) == records
+
+
+def test_sanskrit_name_is_the_fallback_key():
+    records = [disease('Unknown', ['cough'], sanskrit='Kasa'), disease('', ['cough'], sanskrit='kasa')]
+    assert len(dedupe_diseases(records)) == 1
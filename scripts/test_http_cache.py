@@ -0,0 +1,78 @@
+"""Tests for the spider's content-addressed HTTP cache (run with pytest from scripts/)"""
+
+import hashlib
+import os
+
+import pytest
+
+pytest.importorskip('scrapy')
+
+from scrapy import Request, Spider
+from scrapy.downloadermiddlewares.httpcache import HttpCacheMiddleware
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import Response
+from scrapy.utils.test import get_crawler
+
+from http_cache import ContentAddressedCacheStorage, http_cache_settings
+
+
+def open_crawler(cache_dir, offline):
+    settings = http_cache_settings(offline=offline)
+    settings['HTTPCACHE_DIR'] = str(cache_dir)
+    crawler = get_crawler(Spider, settings)
+    crawler.spider = Spider.from_crawler(crawler, name='fixture')
+    return crawler
+
+
+def open_storage(crawler):
+    storage = ContentAddressedCacheStorage(crawler.settings)
+    storage.open_spider(crawler.spider)
+    return storage
+
+
+def store(crawler, url, body):
+    open_storage(crawler).store_response(crawler.spider, Request(url), Response(url, body=body))
+
+
+def cached_body(crawler, url):
+    return open_storage(crawler).retrieve_response(crawler.spider, Request(url)).body
+
+
+def blob_path(cache_dir, body):
+    digest = hashlib.sha256(body).hexdigest()
+    return os.path.join(cache_dir, 'blobs', digest[:2], digest)
+
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    crawler = open_crawler(tmp_path, offline=False)
+    store(crawler, 'https://a.example/book.pdf', b'OLD PDF')
+    store(crawler, 'https://b.example/book.pdf', b'OLD PDF')
+    assert os.stat(blob_path(tmp_path, b'OLD PDF')).st_nlink == 3
+
+
+def test_restoring_a_changed_body_leaves_other_urls_alone(tmp_path):
+    crawler = open_crawler(tmp_path, offline=False)
+    store(crawler, 'https://a.example/book.pdf', b'OLD PDF')
+    store(crawler, 'https://b.example/book.pdf', b'OLD PDF')
+
+    store(crawler, 'https://a.example/book.pdf', b'NEW EDITION')
+    assert cached_body(crawler, 'https://a.example/book.pdf') == b'NEW EDITION'
+    assert cached_body(crawler, 'https://b.example/book.pdf') == b'OLD PDF'
+    with open(blob_path(tmp_path, b'OLD PDF'), 'rb') as f:
+        assert f.read() == b'OLD PDF'
+    with open(blob_path(tmp_path, b'NEW EDITION'), 'rb') as f:
+        assert f.read() == b'NEW EDITION'
+
+
+def test_offline_replays_fixture_and_drops_misses(tmp_path):
+    store(open_crawler(tmp_path, offline=False), 'https://a.example/book.pdf', b'OLD PDF')
+
+    crawler = open_crawler(tmp_path, offline=True)
+    middleware = HttpCacheMiddleware.from_crawler(crawler)
+    middleware.spider_opened(crawler.spider)
+
+    response = middleware.process_request(Request('https://a.example/book.pdf'))
+    assert response.body == b'OLD PDF'
+    assert 'cached' in response.flags
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(Request('https://a.example/missing.pdf'))
@@ -0,0 +1,38 @@
+"""
+Import-time budget for the data scripts (run with pytest from scripts/).
+
+Each module is imported in a fresh interpreter; it must import within the
+budget and must not pull in spaCy, whose models are loaded on first use
+through nlp_models.py instead.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BUDGET_SECONDS = 0.5
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{'seconds': time.perf_counter() - start, 'spacy': 'spacy' in sys.modules}}))
+'''
+
+
+def import_time(module):
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, '-c', PROBE.format(module=module)], cwd=scripts_dir,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, f"Importing {module} failed:\n{result.stderr}"
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('module', ['enhance_disease_data', 'merge_disease_datasets', 'nlp_models'])
+def test_import_is_fast_and_does_not_load_spacy(module):
+    timing = import_time(module)
+    assert not timing['spacy'], f"{module} imports spaCy at import time"
+    assert timing['seconds'] <= BUDGET_SECONDS, f"{module} took {timing['seconds']:.3f}s to import"
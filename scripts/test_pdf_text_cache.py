@@ -0,0 +1,18 @@
+"""Tests for the page-level PDF text cache (run with pytest from scripts/)"""
+
+from pdf_text_cache import PageTextCache
+
+
+def test_page_text_round_trips_line_endings(tmp_path):
+    cache = PageTextCache('0' * 64, extractor='PyPDF2', cache_dir=str(tmp_path))
+    text = 'Jvara\r\nfever\rKasa\ncough\r\n'
+    cache.put(1, text)
+    assert cache.get(1) == text
+
+
+def test_pages_without_text_are_cached_as_empty(tmp_path):
+    cache = PageTextCache('0' * 64, cache_dir=str(tmp_path))
+    assert cache.get(1) is None
+    cache.put(1, None)
+    assert cache.get(1) == ''
+    assert cache.missing([1, 2]) == [2]